@@ -0,0 +1,598 @@
+"""
+Offline load test: drives kuriso Starlette app in-process with synthetic osu! clients.
+
+Usage (from repository root):
+    python benchmarks/loadtest.py                       # 500 clients, 20 poll rounds
+    python benchmarks/loadtest.py --clients 2000 --rounds 50 --seed 7
+    python benchmarks/loadtest.py --mysql-latency 0.5 --redis-latency 0.2  # like remote servers
+
+MySQL, Redis and GeoIP are replaced by in-memory stand-ins, so only kuriso code is measured.
+Clients log in concurrently with the real login body (--concurrency limits requests in flight),
+then each round every client polls once, concurrently too:
+chatters write to #osu, spectated hosts send frames and players in started matches send score updates.
+Reported are p50/p99/max latency per request type and overall throughput.
+"""
+import argparse
+import asyncio
+import datetime
+import fnmatch
+import hashlib
+import logging
+import os
+import random
+import re
+import struct
+import sys
+import time
+import types
+from collections import defaultdict
+from typing import Any, Awaitable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)  # handlers are loaded by relative paths
+
+# pylint: disable=wrong-import-position,unused-argument
+import bcrypt
+from starlette.applications import Starlette
+
+import loops
+import registrator
+from blob import Context
+from bot.bot import CrystalBot
+from config import Config
+from objects.Multiplayer import Match
+from objects.constants import Privileges
+from packets.Builder.index import KurisoPacketWriter
+from packets.OsuPacketID import OsuPacketID
+from packets.Reader.OsuTypes import osuTypes
+
+PASSWORD_MD5 = hashlib.md5(b"loadtest").hexdigest()
+FIRST_USER_ID = 1000
+BOT_ID = 999
+
+# time, id, 300/100/50/geki/katu/miss, score, max combo, combo, perfect, hp, tag, score v2
+SCORE_FRAME = struct.Struct("<iB6HiHH?BB?")
+
+
+class FakeBackend:
+    """
+    Counts round trips and simulates network latency of real server
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.round_trips = 0
+        self.in_pipeline = False
+
+    async def round_trip(self) -> None:
+        if self.in_pipeline:
+            return
+
+        self.round_trips += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+class FakePipeline:
+    """
+    Buffers commands of FakeRedis and executes them by one round trip
+    """
+
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.commands: List[Tuple[str, tuple]] = []
+
+    def __getattr__(self, name: str):
+        def command(*args):
+            self.commands.append((name, args))
+            return self
+
+        return command
+
+    async def execute(self) -> List[Any]:
+        await self.redis.round_trip()
+        self.redis.in_pipeline = True
+        try:
+            return [await getattr(self.redis, name)(*args) for (name, args) in self.commands]
+        finally:
+            self.redis.in_pipeline = False
+            self.commands.clear()
+
+
+class FakeDatabase(FakeBackend):
+    """
+    Stand-in for databases.Database, answers queries used by login/poll flows from memory
+    """
+
+    def __init__(self, users: Dict[int, Dict[str, Any]], latency: float = 0.0):
+        super().__init__(latency)
+        self.users = users
+        self.users_by_safe_name = {user["username_safe"]: user for user in users.values()}
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return re.sub(r"\s+", " ", query).strip().lower()
+
+    @staticmethod
+    def stats_row() -> Mapping:
+        stats = {
+            "total_score": 123_456_789,
+            "ranked_score": 98_765_432,
+            "pp": 4321,
+            "total_plays": 5432,
+            "accuracy": 98.76,
+            "playtime": 100_000,
+        }
+        # columns of every mode are aliased with mode suffix (total_score_std, pp_mania, ...)
+        return {
+            **stats,
+            **{
+                f"{field}_{mode}": value
+                for mode in ("std", "taiko", "ctb", "mania")
+                for (field, value) in stats.items()
+            },
+        }
+
+    async def fetch_one(self, query: str, values: Mapping = None) -> Optional[Mapping]:
+        await self.round_trip()
+        query = self.normalize(query)
+        values = values or {}
+
+        if "where u.username_safe" in query:  # combined login query
+            if not (user := self.users_by_safe_name.get(values["username_safe"], None)):
+                return None
+            return {**user, "country": "RU", "has_hardware": 1}
+        if "from users where username_safe" in query:
+            return self.users_by_safe_name.get(values["username_safe"], None)
+        if "from users where id" in query:
+            return self.users.get(values.get("id", values.get("bot_id")), None)
+        if "from hw_user where userid" in query:
+            return {"id": 1}
+        if "from users_stats" in query and "total_score_" in query:
+            return self.stats_row()
+        if "country from users_stats" in query:
+            return {"country": "RU"}
+
+        return None
+
+    async def fetch_all(self, query: str, values: Mapping = None) -> List[Mapping]:
+        await self.round_trip()
+        query = self.normalize(query)
+
+        if "from users_stats where id in" in query:  # bulk stats refresh
+            return [{"id": uid, **self.stats_row()} for uid in (values or {}).values()]
+        if "from bancho_channels" in query:
+            return [
+                {
+                    "server_name": name,
+                    "description": f"{name} channel",
+                    "public_read": True,
+                    "public_write": True,
+                }
+                for name in ("#osu", "#announce", "#english", "#russian")
+            ]
+
+        return []
+
+    async def execute(self, *_) -> int:
+        await self.round_trip()
+        return 1
+
+
+class FakeRedis(FakeBackend):
+    """
+    Stand-in for aioredis client with strings, sets and sorted sets (ranks only)
+    """
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(latency)
+        self.data: Dict[str, Any] = {}
+
+    async def set(self, key: str, value: Any) -> bool:
+        await self.round_trip()
+        self.data[key] = str(value)
+        return True
+
+    async def get(self, key: str) -> Optional[str]:
+        await self.round_trip()
+        return self.data.get(key, None)
+
+    async def exists(self, *keys: str) -> int:
+        await self.round_trip()
+        return sum(1 for key in keys if key in self.data)
+
+    async def delete(self, *keys: str) -> int:
+        await self.round_trip()
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    async def sadd(self, key: str, *members: str) -> int:
+        await self.round_trip()
+        members_set = self.data.setdefault(key, set())
+        before = len(members_set)
+        members_set.update(members)
+        return len(members_set) - before
+
+    async def srem(self, key: str, *members: str) -> int:
+        await self.round_trip()
+        members_set = self.data.get(key, set())
+        before = len(members_set)
+        members_set.difference_update(members)
+        if not members_set:
+            self.data.pop(key, None)
+        return before - len(members_set)
+
+    async def sismember(self, key: str, member: str) -> bool:
+        await self.round_trip()
+        return member in self.data.get(key, set())
+
+    async def zrevrank(self, key: str, member: str) -> Optional[int]:
+        await self.round_trip()
+        if not key.startswith("ripple:leaderboard:"):
+            return None
+
+        return int(member) - FIRST_USER_ID  # users are ranked by their id
+
+    async def zrem(self, key: str, *members: str) -> int:
+        await self.round_trip()
+        return 0
+
+    async def publish(self, channel: str, message: str) -> int:
+        await self.round_trip()
+        return 0
+
+    async def keys(self, pattern: str) -> List[str]:
+        await self.round_trip()
+        return [key for key in self.data if fnmatch.fnmatchcase(key, pattern)]
+
+    async def scan(
+        self, cursor: int = 0, match: str = "*", count: int = 10
+    ) -> Tuple[int, List[str]]:
+        # whole keyspace is one batch
+        return 0, await self.keys(match)
+
+    async def unlink(self, *keys: str) -> int:
+        return await self.delete(*keys)
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def close(self) -> None:
+        return None
+
+
+class FakeGeoIP:
+    """
+    Stand-in for geoip2.database.Reader
+    """
+
+    @staticmethod
+    def city(_):
+        return types.SimpleNamespace(
+            country=types.SimpleNamespace(iso_code="RU"),
+            location=types.SimpleNamespace(latitude=55.75, longitude=37.61),
+        )
+
+
+def make_users(clients: int) -> Dict[int, Dict[str, Any]]:
+    # low cost hash, we measure bancho not bcrypt
+    password_hash = bcrypt.hashpw(PASSWORD_MD5.encode(), bcrypt.gensalt(4)).decode()
+    users = {}
+    for user_id in [BOT_ID, *range(FIRST_USER_ID, FIRST_USER_ID + clients)]:
+        name = "Crystal" if user_id == BOT_ID else f"loadtest_{user_id}"
+        users[user_id] = {
+            "id": user_id,
+            "username": name,
+            "username_safe": name.lower(),
+            "password_md5": password_hash,
+            "salt": "",
+            "password_version": 2,
+            "silence_end": 0,
+            "privileges": Privileges.USER_PUBLIC | Privileges.USER_NORMAL,
+            "donor_expire": 0,
+        }
+
+    return users
+
+
+def client_packet(packet_id: OsuPacketID, *args: Tuple[Any, int]) -> bytes:
+    return KurisoPacketWriter.CreateBanchoPacket(packet_id, *args)
+
+
+def match_create_packet(host_id: int, name: str) -> bytes:
+    match = Match(0, name, "", host=types.SimpleNamespace(id=host_id))
+    match.beatmap_name = "xi - FREEDOM DiVE [FOUR DIMENSIONS]"
+    match.beatmap_md5 = "0123456789abcdef0123456789abcdef"
+    match.beatmap_id = 129891
+    return client_packet(OsuPacketID.Client_MatchCreate, ((match, True), osuTypes.match))
+
+
+def score_frame_packet(rng: random.Random) -> bytes:
+    frame = SCORE_FRAME.pack(
+        rng.randint(0, 300_000),
+        0,
+        *[rng.randint(0, 500) for _ in range(6)],
+        rng.randint(0, 10_000_000),
+        rng.randint(0, 2000),
+        rng.randint(0, 2000),
+        False,
+        200,
+        0,
+        False,
+    )
+    return client_packet(OsuPacketID.Client_MatchScoreUpdate, (frame, osuTypes.raw))
+
+
+class Client:
+    __slots__ = ("user_id", "name", "ip", "token", "kinds", "received")
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.name = f"loadtest_{user_id}"
+        self.ip = f"10.{user_id >> 16 & 0xFF}.{user_id >> 8 & 0xFF}.{user_id & 0xFF}"
+        self.token = ""
+        self.kinds: List[str] = []  # what this client does every round
+        self.received = 0
+
+
+class LoadTest:
+    def __init__(self, app: Starlette, args: argparse.Namespace):
+        self.app = app
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.clients = [Client(FIRST_USER_ID + ind) for ind in range(args.clients)]
+        self.timings: Dict[str, List[int]] = defaultdict(list)
+        self.osu_version = f"b{datetime.date.today():%Y%m%d}"
+
+    async def request(
+        self,
+        client: Client,
+        kind: str,
+        body: bytes,
+        token: str = "",
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        headers = [
+            (b"host", b"c.kurikku.pw"),
+            (b"user-agent", b"osu!"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        if token:
+            headers.append((b"osu-token", token.encode()))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/",
+            "raw_path": b"/",
+            "query_string": b"",
+            "root_path": "",
+            "headers": headers,
+            "client": (client.ip, 50000),
+            "server": ("c.kurikku.pw", 80),
+        }
+        response: Dict[str, Any] = {"body": bytearray()}
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {k.decode(): v.decode() for k, v in message["headers"]}
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+
+        start_time = time.perf_counter_ns()
+        await self.app(scope, receive, send)
+        self.timings[kind].append(time.perf_counter_ns() - start_time)
+
+        if response["status"] != 200:
+            raise RuntimeError(f"{kind} request of {client.name} failed: {response['status']}")
+
+        client.received += len(response["body"])
+        return response["status"], response["headers"], bytes(response["body"])
+
+    async def login(self, client: Client) -> None:
+        hashes = ":".join(
+            hashlib.md5(f"{client.user_id}{x}".encode()).hexdigest() for x in range(5)
+        )
+        body = f"{client.name}\n{PASSWORD_MD5}\n{self.osu_version}|3|1|{hashes}:|0\n".encode()
+        _, headers, _ = await self.request(client, "login", body)
+        client.token = headers.get("cho-token", "")
+        if not client.token:
+            raise RuntimeError(f"{client.name} can't login")
+
+    async def setup_scenarios(self) -> None:
+        clients = list(self.clients)
+        self.rng.shuffle(clients)
+
+        # spectators: host sends frames every round
+        for _ in range(self.args.spectated):
+            host, spectators = clients[0], clients[1 : 1 + self.args.spectators]
+            clients = clients[1 + self.args.spectators :]
+            host.kinds.append("frames")
+            for spectator in spectators:
+                await self.request(
+                    spectator,
+                    "spectate_start",
+                    client_packet(
+                        OsuPacketID.Client_StartSpectating, (host.user_id, osuTypes.int32)
+                    ),
+                    spectator.token,
+                )
+
+        # multiplayer: host creates match, others join, host starts, everyone sends score updates
+        for ind in range(self.args.matches):
+            players, clients = clients[: self.args.match_size], clients[self.args.match_size :]
+            if not players:
+                break
+
+            host = players[0]
+            await self.request(
+                host,
+                "match_create",
+                match_create_packet(host.user_id, f"loadtest match {ind}"),
+                host.token,
+            )
+            match_id = Context.players.get_token(token=host.token).match.id
+            for player in players[1:]:
+                await self.request(
+                    player,
+                    "match_join",
+                    client_packet(
+                        OsuPacketID.Client_MatchJoin,
+                        (match_id, osuTypes.int32),
+                        ("", osuTypes.string),
+                    ),
+                    player.token,
+                )
+            await self.request(
+                host, "match_start", client_packet(OsuPacketID.Client_MatchStart), host.token
+            )
+            for player in players:
+                player.kinds.append("score")
+
+        for client in self.clients:
+            if self.rng.random() < self.args.chat_rate:
+                client.kinds.append("chat")
+
+    def round_body(self, client: Client, round_ind: int) -> bytes:
+        packets = []
+        for kind in client.kinds:
+            if kind == "chat":
+                packets.append(
+                    client_packet(
+                        OsuPacketID.Client_SendIrcMessage,
+                        (client.name, osuTypes.string),
+                        (f"loadtest message #{round_ind} from {client.name}", osuTypes.string),
+                        ("#osu", osuTypes.string),
+                        (client.user_id, osuTypes.int32),
+                    ),
+                )
+            elif kind == "frames":
+                frames = self.rng.randbytes(self.args.frame_size)
+                packets.append(
+                    client_packet(OsuPacketID.Client_SpectateFrames, (frames, osuTypes.raw))
+                )
+            elif kind == "score":
+                packets.append(score_frame_packet(self.rng))
+
+        return b"".join(packets)
+
+    async def poll(self, client: Client, round_ind: int) -> None:
+        kind = "+".join(client.kinds) or "poll"
+        await self.request(client, kind, self.round_body(client, round_ind), client.token)
+
+    async def run_concurrently(self, requests: Iterable[Awaitable]) -> None:
+        # up to --concurrency clients have requests in flight at once
+        semaphore = asyncio.Semaphore(self.args.concurrency or len(self.clients))
+
+        async def limited(request: Awaitable) -> None:
+            async with semaphore:
+                await request
+
+        await asyncio.gather(*(limited(request) for request in requests))
+
+    async def run(self) -> float:
+        start_time = time.perf_counter()
+        await self.run_concurrently(self.login(client) for client in self.clients)
+
+        await self.setup_scenarios()
+
+        for round_ind in range(self.args.rounds):
+            # scheduler jobs in kuriso
+            await loops.flush_channels_info()
+            await loops.flush_write_behind()
+            await loops.flush_online_users()
+            await self.run_concurrently(self.poll(client, round_ind) for client in self.clients)
+
+        return time.perf_counter() - start_time
+
+    def report(self, elapsed: float) -> None:
+        def percentile(values: List[int], pct: float) -> float:
+            return values[min(len(values) - 1, int(len(values) * pct))] / 1e6
+
+        print(f"{'request':<22}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        total = 0
+        for kind, values in sorted(self.timings.items()):
+            values.sort()
+            total += len(values)
+            print(
+                f"{kind:<22}{len(values):>8}{percentile(values, 0.5):>10.3f}"
+                f"{percentile(values, 0.99):>10.3f}{values[-1] / 1e6:>10.3f}",
+            )
+
+        handled = sum(sum(values) for values in self.timings.values()) / 1e9
+        received = sum(client.received for client in self.clients)
+        print(
+            f"\n{total} requests in {elapsed:.2f}s wall ({handled:.2f}s summed request time): "
+            f"{total / elapsed:.0f} req/s, {received / 1024 / 1024:.1f} MiB sent to clients",
+        )
+        print(
+            f"mysql queries: {Context.mysql.round_trips}, redis commands: {Context.redis.round_trips}"
+        )
+
+
+async def setup_context(args: argparse.Namespace) -> Starlette:
+    Config.load_config()
+    Config.config["prometheus"]["enabled"] = False
+    Config.config["profiling"]["enabled"] = False
+
+    Context.mysql = FakeDatabase(make_users(args.clients), args.mysql_latency / 1000)
+    Context.redis = FakeRedis(args.redis_latency / 1000)
+    Context.geoip_db = FakeGeoIP()
+    Context.bancho_settings = {
+        "bancho_maintenance": 0,
+        "menu_icon": "",
+        "login_notification": "",
+    }
+    Context.version, Context.commit_id = "loadtest", "0000000"
+    Context.motd_html = "kuriso loadtest"
+
+    app = Starlette()
+    registrator.load_handlers(app)
+    await registrator.load_default_channels()
+    CrystalBot.bot_id = BOT_ID
+    await CrystalBot.connect()
+    return app
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="kuriso in-process load test")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20, help="poll rounds after login")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=0,
+        help="clients with requests in flight at once (0 - all clients)",
+    )
+    parser.add_argument(
+        "--chat-rate", type=float, default=0.05, help="share of clients chatting in #osu"
+    )
+    parser.add_argument("--spectated", type=int, default=5, help="count of spectated hosts")
+    parser.add_argument("--spectators", type=int, default=20, help="spectators per host")
+    parser.add_argument(
+        "--frame-size", type=int, default=512, help="bytes of spectator frames per round"
+    )
+    parser.add_argument("--matches", type=int, default=5)
+    parser.add_argument("--match-size", type=int, default=8)
+    parser.add_argument("--mysql-latency", type=float, default=0.0, help="ms per mysql query")
+    parser.add_argument("--redis-latency", type=float, default=0.0, help="ms per redis command")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)  # don't measure log formatting
+    app = await setup_context(args)
+
+    loadtest = LoadTest(app, args)
+    elapsed = await loadtest.run()
+    loadtest.report(elapsed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,215 @@
+"""
+Micro-benchmark for every PacketBuilder method.
+
+Usage (from repository root):
+    python benchmarks/packet_builder.py                  # print per-packet cost
+    python benchmarks/packet_builder.py --against HEAD~1 # compare with PacketBuilder from git revision
+
+`--against` loads `packets/Builder/index.py` from the given git revision next to the current one,
+measures both implementations interleaved (so machine noise hits them equally) and checks
+that every packet is still encoded byte-for-byte identical.
+"""
+import argparse
+import functools
+import inspect
+import os
+import subprocess
+import sys
+import timeit
+import types
+from typing import Callable, Dict, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# pylint: disable=wrong-import-position
+from objects.BanchoObjects import Message
+from objects.Multiplayer import Match
+from objects.Player import Player
+from objects.constants.GameModes import GameModes
+from objects.constants.Modificators import Mods
+from objects.constants.Slots import SlotStatus
+from objects.constants.multiplayer import MultiSpecialModes
+from packets.Builder.index import PacketBuilder
+
+
+class _FakeChannel:
+    name = "#osu"
+    description = "Main osu! channel, welcome to the club buddy"
+    users = list(range(1500))
+
+
+def _make_player(user_id: int, name: str) -> Player:
+    player = Player(user_id, name, 3, utc_offset=3)
+    player.country = (100, "RU")
+    player.location = (55.75, 37.61)
+    player.pr_status.update(
+        action=2,
+        action_text="xi - FREEDOM DiVE [FOUR DIMENSIONS]",
+        map_md5="0123456789abcdef0123456789abcdef",
+        mods=Mods.Hidden | Mods.HardRock,
+        mode=0,
+        map_id=129891,
+    )
+    for mode in GameModes:
+        player.stats[mode].update(
+            total_score=123_456_789_012,
+            ranked_score=98_765_432_101,
+            pp=12345,
+            accuracy=98.76,
+            total_plays=54321,
+            playtime=1_000_000,
+            leaderboard_rank=42,
+        )
+
+    return player
+
+
+def _make_match(host: Player) -> Match:
+    match = Match(1, "kuriso benchmark lobby", "secret", host)
+    match.beatmap_name = "xi - FREEDOM DiVE [FOUR DIMENSIONS]"
+    match.beatmap_md5 = "0123456789abcdef0123456789abcdef"
+    match.beatmap_id = 129891
+    match.match_freemod = MultiSpecialModes.Freemod
+    for ind, slot in enumerate(match.slots):
+        slot.status = SlotStatus.NotReady
+        slot.token = _make_player(1000 + ind, f"player_{ind}")
+        slot.mods = Mods.Hidden
+
+    return match
+
+
+def load_builder(revision: str) -> type:
+    source = subprocess.check_output(
+        ["git", "show", f"{revision}:packets/Builder/index.py"],
+        cwd=ROOT_DIR,
+    )
+    module = types.ModuleType(f"packet_builder_{revision}")
+    # pylint: disable=exec-used
+    exec(compile(source, f"{revision}:packets/Builder/index.py", "exec"), module.__dict__)
+    return module.PacketBuilder
+
+
+def build_cases(builder: type = PacketBuilder) -> Dict[str, Tuple[Callable, tuple]]:
+    player = _make_player(1000, "KotRik")
+    match = _make_match(player)
+    message = Message(
+        sender="KotRik",
+        body="Hello, that is my test message for benchmarks! " * 2,
+        to="#osu",
+        client_id=1000,
+    )
+    frame = bytes(range(256)) * 4
+    score_frame = bytearray(29)
+
+    args = {
+        "UserID": (1000,),
+        "MainMenuIcon": ("https://i.kurikku.pw/logo.png|https://kurikku.pw",),
+        "Notification": ("Welcome to kuriso!\nBuild ver: v1.0.0\nCommit: 0000000",),
+        "ProtocolVersion": (19,),
+        "BanchoPrivileges": (player.bancho_privs,),
+        "FriendList": (list(range(1000, 1100)),),
+        "SilenceEnd": (0,),
+        "UserPresence": (player,),
+        "UserStats": (player,),
+        "Logout": (1000,),
+        "SuccessJoinChannel": ("#osu",),
+        "ErrorJoinChannel": ("#osu",),
+        "PartChannel": ("#osu",),
+        "BuildMessage": (1000, message),
+        "ChannelAvailable": (_FakeChannel(),),
+        "ChannelListeningEnd": (),
+        "PMBlocked": ("KotRik",),
+        "TargetSilenced": ("KotRik",),
+        "FellowSpectatorJoined": (1000,),
+        "SpectatorJoined": (1000,),
+        "FellowSpectatorLeft": (1000,),
+        "SpectatorLeft": (1000,),
+        "CantSpectate": (1000,),
+        "QuickSpectatorFrame": (frame,),
+        "UpdateMatch": (match,),
+        "NewMatch": (match,),
+        "MatchJoinSuccess": (match,),
+        "MatchJoinFailed": (),
+        "InitiateStartMatch": (match,),
+        "DisbandMatch": (match,),
+        "MatchHostTransfer": (),
+        "MultiSkip": (),
+        "AllPlayersLoaded": (),
+        "MultiScoreUpdate": (score_frame,),
+        "MatchFinished": (),
+        "MatchPlayerFailed": (3,),
+        "BanchoRestarting": (20000,),
+        "UserSilenced": (1000,),
+        "UserRestricted": (),
+        "SwitchServer": ("c.kurikku.pw",),
+        "RTX": ("boo",),
+        "KillPing": (),
+        "MatchAborted": (),
+    }
+
+    cases = {}
+    for name, func in inspect.getmembers(builder, predicate=inspect.isfunction):
+        if name.startswith("_"):
+            continue
+
+        if name not in args:
+            raise KeyError(f"benchmark doesn't know how to call PacketBuilder.{name}")
+
+        cases[name] = (func, args[name])
+
+    return cases
+
+
+def measure(func: Callable, args: tuple, number: int) -> float:
+    return (
+        timeit.Timer(functools.partial(func, *args)).timeit(number=number) / number * 1e9
+    )  # ns/packet
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PacketBuilder micro-benchmark")
+    parser.add_argument("--against", help="git revision to compare with")
+    parser.add_argument("--rounds", type=int, default=7, help="measure rounds, best is taken")
+    parser.add_argument("--filter", default="", help="run only packets containing this text")
+    args = parser.parse_args()
+
+    current = build_cases()
+    baseline = build_cases(load_builder(args.against)) if args.against else {}
+
+    mismatched = []
+    header = f"{'packet':<24}{'size':>8}{'ns/packet':>12}"
+    if baseline:
+        header += f"{args.against:>12}{'speedup':>10}"
+    print(header)
+
+    for name, (func, func_args) in current.items():
+        if args.filter not in name:
+            continue
+
+        packet = func(*func_args)
+        number, _ = timeit.Timer(functools.partial(func, *func_args)).autorange()
+
+        cost, before = float("inf"), float("inf")
+        for _ in range(args.rounds):
+            cost = min(cost, measure(func, func_args, number))
+            if name in baseline:
+                old_func, old_args = baseline[name]
+                before = min(before, measure(old_func, old_args, number))
+
+        line = f"{name:<24}{len(packet):>8}{cost:>12.0f}"
+        if name in baseline:
+            line += f"{before:>12.0f}{before / cost:>9.2f}x"
+            old_func, old_args = baseline[name]
+            if old_func(*old_args) != packet:
+                mismatched.append(name)
+        print(line)
+
+    if mismatched:
+        print(f"\nPACKETS CHANGED THEIR CONTENT: {', '.join(mismatched)}")
+
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
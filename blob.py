@@ -2,7 +2,7 @@
 This file contains context features :sip:
 """
 import os
-from typing import Dict
+from typing import Dict, Set, Union
 
 import databases
 import geoip2.database
@@ -26,6 +26,7 @@ class Context:
 
     players: TokenStorage = TokenStorage()
     channels: Dict[str, "Channel"] = {}
+    changed_channels: Set["Channel"] = set()  # their member counts will be sent by loop
     matches: Dict[int, "Match"] = {}  # TODO: Union with matches
     matches_id: int = 1  # default value when bancho is up!
 
@@ -46,7 +47,7 @@ class Context:
 
     geoip_db: geoip2.database.Reader = None
 
-    stats: Dict[str, prometheus_client.Gauge] = {
+    stats: Dict[str, Union[prometheus_client.Gauge, prometheus_client.Histogram]] = {
         "online_users": prometheus_client.Gauge(
             "kuriso_online_users",
             "Counter of online users on kuriso",
@@ -60,6 +61,55 @@ class Context:
             "Most popular osu versions right now!",
             ("osu_version",),
         ),
+        "queued_bytes": prometheus_client.Gauge(
+            "kuriso_queued_bytes",
+            "Bytes waiting in players queues for next poll",
+        ),
+        "queue_overflows": prometheus_client.Gauge(
+            "kuriso_queue_overflows",
+            "Count of players queue overflows",
+            ("policy",),
+        ),
+        "packet_handle_time": prometheus_client.Histogram(
+            "kuriso_packet_handle_seconds",
+            "Time spent in packet handler",
+            ("packet",),
+            buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0),
+        ),
+        "packet_payload_size": prometheus_client.Histogram(
+            "kuriso_packet_payload_bytes",
+            "Size of packet data sent by client",
+            ("packet",),
+            buckets=(0, 8, 32, 128, 512, 2048, 8192, 32768),
+        ),
+        "request_handle_time": prometheus_client.Histogram(
+            "kuriso_request_handle_seconds",
+            "Time spent on osu! client poll request by stage (parse, dispatch)",
+            ("stage",),
+            buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0),
+        ),
+        "login_stage_time": prometheus_client.Histogram(
+            "kuriso_login_stage_seconds",
+            "Time spent on login by stage (auth, checks, player, join)",
+            ("stage",),
+            buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+        ),
+        "response_size": prometheus_client.Histogram(
+            "kuriso_response_bytes",
+            "Size of response sent to osu! client poll request",
+            buckets=(0, 64, 256, 1024, 4096, 16384, 65536, 262144, 1048576),
+        ),
+        "pubsub_events": prometheus_client.Gauge(
+            "kuriso_pubsub_events",
+            "Count of received redis pub/sub events",
+            ("channel",),
+        ),
+        "pubsub_handle_time": prometheus_client.Histogram(
+            "kuriso_pubsub_handle_seconds",
+            "Time spent in redis pub/sub event handler",
+            ("channel",),
+            buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+        ),
         "devclient_usage": prometheus_client.Gauge(
             "kuriso_devclient_usage",
             "Usage of devserver right now",
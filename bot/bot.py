@@ -12,7 +12,6 @@ from lib import logger
 from objects.BanchoObjects import Message
 from objects.BotPlayer import BotPlayer
 from objects.constants.KurikkuPrivileges import KurikkuPrivileges
-from packets.Builder.index import PacketBuilder
 
 if TYPE_CHECKING:
     from objects.Player import Player
@@ -59,9 +58,9 @@ class CrystalBot:
             ]
         )
 
-        u_panel = PacketBuilder.UserPresence(token)
-        u_stats = PacketBuilder.UserStats(token)
-        for user in Context.players.get_all_tokens():
+        u_panel = token.presence_packet
+        u_stats = token.stats_packet
+        for user in Context.players.all_tokens():
             user.enqueue(u_panel)
             user.enqueue(u_stats)
 
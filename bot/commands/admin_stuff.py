@@ -24,7 +24,7 @@ async def alert(args: List[str], *_):
         return "What do you wanna to say?"
 
     notify_packet = PacketBuilder.Notification(" ".join(args))
-    for user in Context.players.get_all_tokens(ignore_tournament_clients=True):
+    for user in Context.players.primary_tokens():
         user.enqueue(notify_packet)
 
     return "Await your msg!"
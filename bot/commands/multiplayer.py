@@ -102,9 +102,7 @@ async def mp_make(args: List[str], player: "Player", _):
         await match_channel.join_channel(player)
 
     info_packet = PacketBuilder.NewMatch(match)
-    for user in Context.players.get_all_tokens(ignore_tournament_clients=True):
-        if not user.is_in_lobby:
-            continue
+    for user in Context.players.lobby_tokens():
         user.enqueue(info_packet)
 
     if player.is_tourneymode:
@@ -43,6 +43,56 @@ class Config:
                 "enabled": os.environ.get("SENTRY_ENABLED", False) in (True, "True"),
                 "url": os.environ.get("SENTRY_URL", ""),
             },
+            "queue": {
+                # max bytes waiting in player's outbound queue between polls (0 - no limit)
+                "max_size": int(os.environ.get("QUEUE_MAX_SIZE", "8388608")),
+                # what to do on overflow: "drop" new packets or "kick" player
+                "overflow_policy": os.environ.get("QUEUE_OVERFLOW_POLICY", "kick"),
+                # max bytes of spectator frames kept for spectators, older frames are dropped (0 - no limit)
+                "spectator_max_size": int(
+                    os.environ.get("SPECTATOR_QUEUE_MAX_SIZE", "1048576")
+                ),
+            },
+            "channels": {
+                # how often (seconds) member counts of public channels are sent to players
+                "info_interval": float(os.environ.get("CHANNELS_INFO_INTERVAL", "1")),
+            },
+            "online_users": {
+                # how often (seconds) changed online count is written to redis
+                "flush_interval": float(os.environ.get("ONLINE_USERS_FLUSH_INTERVAL", "1")),
+            },
+            "stats": {
+                # LETS stats updates are collected for refresh_window (ms) and loaded by one query
+                "refresh_window": int(os.environ.get("STATS_REFRESH_WINDOW", "200")),
+            },
+            "write_behind": {
+                # non-critical login/session writes are flushed every interval seconds
+                # or when max_pending writes are waiting
+                "interval": float(os.environ.get("WRITE_BEHIND_INTERVAL", "1")),
+                "max_pending": int(os.environ.get("WRITE_BEHIND_MAX_PENDING", "500")),
+                # failed writes are retried by next flushes up to max_retries times
+                "max_retries": int(os.environ.get("WRITE_BEHIND_MAX_RETRIES", "3")),
+            },
+            "pubsub": {
+                # events are handled by workers (in order for one user), every worker
+                # queues up to queue_size events
+                "workers": int(os.environ.get("PUBSUB_WORKERS", "16")),
+                "queue_size": int(os.environ.get("PUBSUB_QUEUE_SIZE", "256")),
+            },
+            "multiplayer": {
+                # send match state at most once per update_interval (ms) instead of on every change
+                "coalesce_updates": os.environ.get("MULTIPLAYER_COALESCE_UPDATES", False)
+                in (True, "True"),
+                "update_interval": int(os.environ.get("MULTIPLAYER_UPDATE_INTERVAL", "75")),
+            },
+            "profiling": {
+                # sample packet handlers with cProfile and dump stats every dump_interval seconds
+                "enabled": os.environ.get("PROFILING_ENABLED", False) in (True, "True"),
+                "sample_rate": float(os.environ.get("PROFILING_SAMPLE_RATE", "0.01")),
+                "dump_dir": os.environ.get("PROFILING_DIR", "./profiles"),
+                "dump_interval": int(os.environ.get("PROFILING_DUMP_INTERVAL", "300")),
+                "keep_dumps": int(os.environ.get("PROFILING_KEEP_DUMPS", "12")),
+            },
             "prometheus": {
                 "enabled": os.environ.get("PROMETHEUS_ENABLED", False) in (True, "True"),
                 "port": int(os.environ.get("PROMETHEUS_PORT", "13372")),
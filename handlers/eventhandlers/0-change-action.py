@@ -2,7 +2,6 @@ from handlers.decorators import OsuEvent
 from objects.constants.GameModes import GameModes
 from packets.OsuPacketID import OsuPacketID
 from packets.Reader.PacketResolver import PacketResolver
-from packets.Builder.index import PacketBuilder
 
 from typing import TYPE_CHECKING
 
@@ -22,8 +21,9 @@ async def update_action(packet_data: bytes, p: "Player"):
     # in this case, we should send only new stats
     p.selected_game_mode = GameModes(resolved_data["mode"])
     p.pr_status.update(**resolved_data)
+    p.invalidate_packets()
 
-    data = PacketBuilder.UserStats(p) + PacketBuilder.UserPresence(p)
+    data = p.stats_packet + p.presence_packet
     p.enqueue(data)
     for spec in p.spectators:
         spec.enqueue(data)
@@ -1,6 +1,5 @@
 from blob import Context
 from lib import logger
-from packets.Builder.index import PacketBuilder
 from packets.Reader.PacketResolver import PacketResolver
 from handlers.decorators import OsuEvent
 from packets.OsuPacketID import OsuPacketID
@@ -23,7 +22,7 @@ async def join_spectator(packet_data: bytes, token: "Player"):
 
     if player_spec:
         token.enqueue(
-            PacketBuilder.UserStats(player_spec) + PacketBuilder.UserPresence(player_spec),
+            player_spec.stats_packet + player_spec.presence_packet,
         )
 
     if token.spectating:
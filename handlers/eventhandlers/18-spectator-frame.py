@@ -16,8 +16,7 @@ async def send_spec_frame(packet_data: bytes, token: "Player"):
     This thing is kinda weird because we can't handle properly.
     This thing sending so frequently. We need quick handle for it!
     """
-    spectator_frame = PacketBuilder.QuickSpectatorFrame(packet_data)
-    for recv in token.spectators:
-        recv.enqueue(spectator_frame)
+    # spectators read it from shared relay buffer on their dequeue
+    token.spectator_relay.push(PacketBuilder.QuickSpectatorFrame(packet_data))
 
     return True
@@ -1,6 +1,5 @@
 from handlers.decorators import OsuEvent
 from packets.OsuPacketID import OsuPacketID
-from packets.Builder.index import PacketBuilder
 
 from typing import TYPE_CHECKING
 
@@ -12,5 +11,5 @@ if TYPE_CHECKING:
 @OsuEvent.register_handler(OsuPacketID.Client_RequestStatusUpdate)
 async def refresh_user_stats(_, token: "Player"):
     await token.update_stats()
-    token.enqueue(PacketBuilder.UserStats(token))
+    token.enqueue(token.stats_packet)
     return True
@@ -1,5 +1,4 @@
 from handlers.decorators import OsuEvent
-from objects.constants.Slots import SlotStatus
 from packets.Builder.index import PacketBuilder
 from packets.OsuPacketID import OsuPacketID
 
@@ -13,32 +12,29 @@ if TYPE_CHECKING:
 
 # client packet: 47, bancho response: update match
 @OsuEvent.register_handler(OsuPacketID.Client_MatchScoreUpdate)
-async def match_score_update(packet_data: bytes, token: "Player"):
+async def match_score_update(packet_data: memoryview, token: "Player"):
     if not token.match:
         return False
 
     match = token.match
-    slotInd = -1
-    for (ind, slot) in enumerate(match.slots):
-        if slot.token == token:
-            slotInd = ind
-            break
-    slot = match.slots[slotInd]
+    slot_id = match.score_relay.get_slot_id(token)
+    if slot_id is None:
+        return False  # player doesn't play in this match
+    slot = match.slots[slot_id]
 
     # We need extract score and hp
-    with memoryview(packet_data) as packet:
-        reader = KurisoPacketReader(packet)
-        reader.slice_buffer(17)
-        score = reader.read_int_32()
-        reader.slice_buffer(5)
-        hp_points = reader.read_byte()
+    reader = KurisoPacketReader(packet_data)
+    reader.skip(17)
+    score = reader.read_int_32()
+    reader.skip(5)
+    hp_points = reader.read_byte()
 
     slot.score = score
     slot.failed = hp_points == 254
 
     packet_data = bytearray(packet_data)
-    packet_data[4] = slotInd
+    packet_data[4] = slot_id
 
-    score_updated = PacketBuilder.MultiScoreUpdate(packet_data)
-    await match.enqueue_to_specific(score_updated, SlotStatus.Playing)
+    # playing players get latest frames of every slot on their next dequeue
+    match.score_relay.push(slot_id, PacketBuilder.MultiScoreUpdate(packet_data))
     return True
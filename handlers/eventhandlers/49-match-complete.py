@@ -17,6 +17,7 @@ async def match_change_team(_, token: "Player"):
 
     match = token.match
     slot = match.get_slot(token)
+    match.score_relay.finish(token)  # he gets frames, which were sent before he completed map
     slot.status = SlotStatus.Complete
 
     if any(s.status == SlotStatus.Playing for s in match.slots):
@@ -25,6 +26,7 @@ async def match_change_team(_, token: "Player"):
     await match.match_ended()
     await match.unready_completed()
     match.in_progress = False
+    match.score_relay.stop()
 
     packet_complete = PacketBuilder.MatchFinished()
     await match.enqueue_to_specific(packet_complete, SlotStatus.HasPlayer)
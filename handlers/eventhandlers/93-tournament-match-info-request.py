@@ -28,21 +28,12 @@ async def refresh_user_stats(packet_data: bytes, token: "Player"):
         manager_obj = Context.players.get_token(uid=token.id)
         manager_token = manager_obj.token
 
-        manager_obj.additional_clients.pop(
-            old_token,
-        )  # remove our actual manager form additional clients
+        # remove our actual manager from additional clients
+        manager_obj.remove_additional_client(old_token)
+        # assign our pseudo additional client to manager
+        Context.players.change_token(manager_obj, old_token)
         token.token = manager_token  # moving manager token to additional token
-        manager_obj.additional_clients[
-            manager_token
-        ] = token  # add this token to additional clients
-
-        Context.players.store_by_token.pop(
-            manager_token,
-        )  # remove our additional client from manager accounts
-        manager_obj.token = old_token  # assign our pseudo additional client to manager
-        Context.players.store_by_token[
-            old_token
-        ] = manager_obj  # store this token, like it should be
+        manager_obj.add_additional_client(token, manager_token)
 
         token = manager_obj  # for next code part
 
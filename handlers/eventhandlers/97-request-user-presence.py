@@ -2,7 +2,6 @@ from blob import Context
 from handlers.decorators import OsuEvent
 from packets.OsuPacketID import OsuPacketID
 from packets.Reader.PacketResolver import PacketResolver
-from packets.Builder.index import PacketBuilder
 
 from typing import TYPE_CHECKING
 
@@ -23,6 +22,6 @@ async def request_user_stats(packet_data: bytes, token: "Player"):
             continue
         searched_player = Context.players.get_token(uid=user)
         if searched_player and not searched_player.is_restricted:
-            token.enqueue(PacketBuilder.UserPresence(searched_player))
+            token.enqueue(searched_player.presence_packet)
 
     return True
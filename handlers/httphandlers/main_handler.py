@@ -1,6 +1,10 @@
 import asyncio
 import time
 import datetime
+import struct
+from typing import Dict, List, Tuple
+
+from prometheus_client import Histogram
 
 from bot.bot import CrystalBot
 from lib import logger
@@ -10,14 +14,17 @@ from starlette.responses import HTMLResponse
 from handlers.decorators import HttpEvent, OsuEvent
 from lib.BanchoResponse import BanchoResponse
 from blob import Context
+from config import Config
 from lib.logger import magnitude_fmt_time
+from lib.profiler import PacketProfiler
 from objects.constants import Privileges
 from objects.constants.KurikkuPrivileges import KurikkuPrivileges
 from objects.Player import Player
 from packets.Builder.index import PacketBuilder
 from packets.OsuPacketID import OsuPacketID
-from packets.Reader.index import KurisoPacketReader
+from packets.Reader.index import KurisoPacketReader, PACKET_HEADER
 from helpers import userHelper
+from helpers.writeBehind import WriteBehind
 
 ALLOWED_RESTRICT_PACKETS = [
     OsuPacketID.Client_Exit.value,
@@ -36,6 +43,50 @@ DONT_LOG_PACKETS = [
 ]
 
 
+# packet id -> (handle time, payload size) histograms, labels() lookup isn't free
+PACKET_METRICS: Dict[int, Tuple[Histogram, Histogram]] = {}
+
+
+def get_packet_metrics(packet_id: int) -> Tuple[Histogram, Histogram]:
+    if not (metrics := PACKET_METRICS.get(packet_id, None)):
+        packet_name = OsuPacketID(packet_id).name
+        metrics = PACKET_METRICS[packet_id] = (
+            Context.stats["packet_handle_time"].labels(packet=packet_name),
+            Context.stats["packet_payload_size"].labels(packet=packet_name),
+        )
+
+    return metrics
+
+
+class LoginTimer:
+    """
+    Durations of login stages, they are logged and exported to prometheus
+    """
+
+    __slots__ = ("stages", "last_time")
+
+    def __init__(self, start_time: int):
+        self.stages: List[Tuple[str, int]] = []
+        self.last_time = start_time
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter_ns()
+        self.stages.append((stage, now - self.last_time))
+        self.last_time = now
+
+    def observe(self) -> None:
+        if not Config.config["prometheus"]["enabled"]:
+            return
+
+        for (stage, stage_time) in self.stages:
+            Context.stats["login_stage_time"].labels(stage=stage).observe(stage_time / 1e9)
+
+    def __str__(self) -> str:
+        return ", ".join(
+            f"{stage}: {magnitude_fmt_time(stage_time)}" for (stage, stage_time) in self.stages
+        )
+
+
 @HttpEvent.register_handler("/", methods=["GET", "POST"])
 async def main_handler(request: Request):
     if request.headers.get("user-agent", "") != "osu!" or request.method == "GET":
@@ -50,19 +101,21 @@ async def main_handler(request: Request):
 
         token_object.last_packet_unix = int(time.time())
 
+        collect_metrics = Config.config["prometheus"]["enabled"]
+        dispatch_time = 0
         # packets recieve
         with memoryview(await request.body()) as packets:
+            request_start_time = time.perf_counter_ns()
             raw_bytes = KurisoPacketReader(packets)
             response = bytes()
-            while not raw_bytes.EOF():
-                packet_id = raw_bytes.read_u_int_16()
-                _ = raw_bytes.read_int_8()  # empty byte
-                packet_length = raw_bytes.read_int_32()
+            while raw_bytes.can_read(PACKET_HEADER.size):
+                packet_id, packet_length = raw_bytes.read_packet_header()
 
                 if packet_id == OsuPacketID.Client_Pong.value:
                     # client just spamming it and tries to say, that he is normal :sip:
                     continue
 
+                # handlers get memoryview of request body, copy it if you need to store data
                 data = raw_bytes.slice_buffer(packet_length)
 
                 if token_object.is_restricted and packet_id not in ALLOWED_RESTRICT_PACKETS:
@@ -75,8 +128,26 @@ async def main_handler(request: Request):
                     # This packet can be handled by OsuEvent Class, call it now!
                     # Oh wait let go this thing in async executor.
                     start_time = time.perf_counter_ns()
-                    await OsuEvent.handlers[packet_id](data, token_object)
+                    try:
+                        if PacketProfiler.should_sample():
+                            await PacketProfiler.run(
+                                OsuEvent.handlers[packet_id](data, token_object)
+                            )
+                        else:
+                            await OsuEvent.handlers[packet_id](data, token_object)
+                    except (struct.error, IndexError) as e:
+                        # malformed packet shouldn't break other packets of request
+                        logger.elog(
+                            f"[{token_object.token}/{token_object.name}] Skipped malformed packet {packet_id}: {e}",
+                        )
                     end_time = time.perf_counter_ns()
+                    dispatch_time += end_time - start_time
+
+                    if collect_metrics:
+                        handle_time, payload_size = get_packet_metrics(packet_id)
+                        handle_time.observe((end_time - start_time) / 1e9)
+                        payload_size.observe(packet_length)
+
                     if packet_id not in DONT_LOG_PACKETS:
                         logger.klog(
                             f"<{token_object.name}> Has triggered {OsuPacketID(packet_id)} with packet length: {packet_length} | Request took: {magnitude_fmt_time(end_time - start_time)}",
@@ -84,8 +155,19 @@ async def main_handler(request: Request):
                 else:
                     logger.wlog(f"[Events] Packet ID: {packet_id} not found in events handlers")
 
+            request_time = time.perf_counter_ns() - request_start_time
+
         response += token_object.dequeue()
 
+        if collect_metrics:
+            Context.stats["request_handle_time"].labels(stage="parse").observe(
+                (request_time - dispatch_time) / 1e9,
+            )
+            Context.stats["request_handle_time"].labels(stage="dispatch").observe(
+                dispatch_time / 1e9,
+            )
+            Context.stats["response_size"].observe(len(response))
+
         response = BanchoResponse(bytes(response), token=token_object.token)
         return response
 
@@ -102,14 +184,17 @@ async def main_handler(request: Request):
     if len(loginData) < 3:
         return BanchoResponse(PacketBuilder.UserID(-5))
 
-    if not await userHelper.check_login(loginData[0], loginData[1], request.client.host):
+    login_timer = LoginTimer(start_time)
+    # credentials, start data, hardware and country in one query
+    user_data = await userHelper.get_login_user(loginData[0])
+    if not user_data or not await userHelper.check_login_password(
+        user_data,
+        loginData[1],
+        request.client.host,
+    ):
         logger.elog(f"[{loginData[0]}] tried to login but failed with password")
         return BanchoResponse(PacketBuilder.UserID(-1))
-
-    # auth speed benchmark time
-    user_data = await userHelper.get_start_user(loginData[0])
-    if not user_data:
-        return BanchoResponse(PacketBuilder.UserID(-1))
+    login_timer.mark("auth")
 
     data = loginData[2].split("|")
     hashes = data[3].split(":")[:-1]
@@ -123,9 +208,9 @@ async def main_handler(request: Request):
         # wtf osu
         await Context.players.get_token(uid=user_data["id"]).logout()
 
-    if (
-        user_data["privileges"] & Privileges.USER_PENDING_VERIFICATION
-    ) or not await userHelper.user_have_hardware(user_data["id"]):
+    if (user_data["privileges"] & Privileges.USER_PENDING_VERIFICATION) or not user_data[
+        "has_hardware"
+    ]:
         # we need to verify our user
         is_success_verify = await userHelper.activate_user(
             user_data["id"],
@@ -138,9 +223,11 @@ async def main_handler(request: Request):
             )
             return BanchoResponse(bytes(response))
 
-        user_data = await userHelper.get_start_user(loginData[0])
+        user_data = await userHelper.get_login_user(loginData[0])
 
-    await userHelper.logHardware(user_data["id"], hashes)
+    osu_version = data[0]
+    # side-effect write, it doesn't affect login result
+    WriteBehind.log_hardware(user_data["id"], hashes)
 
     if (user_data["privileges"] & KurikkuPrivileges.Normal) != KurikkuPrivileges.Normal and (
         user_data["privileges"] & Privileges.USER_PENDING_VERIFICATION
@@ -172,8 +259,8 @@ async def main_handler(request: Request):
 
             return BanchoResponse(bytes(response))
 
-    osu_version = data[0]
-    await userHelper.setUserLastOsuVer(user_data["id"], osu_version)
+    WriteBehind.set_osu_version(user_data["id"], osu_version)
+
     osu_version_int = osu_version[1:9]
     if not osu_version_int.isdigit():
         return BanchoResponse(PacketBuilder.UserID(-1))
@@ -197,6 +284,7 @@ async def main_handler(request: Request):
             "Sorry, you use outdated/bad osu!version. Please update your game to join server",
         )
         return BanchoResponse(bytes(response))
+    login_timer.mark("checks")
 
     player_start_params = dict(
         user_id=int(user_data["id"]),
@@ -233,9 +321,10 @@ async def main_handler(request: Request):
         *[
             player.parse_friends(),
             player.update_stats(),
-            player.parse_country(request.client.host),
+            player.parse_country(request.client.host, donor_country=user_data["country"]),
         ]
     )
+    login_timer.mark("player")
 
     if "ppy.sh" in request.url.netloc and not (player.is_admin or player.is_tournament_stuff):
         return BanchoResponse(
@@ -247,16 +336,15 @@ async def main_handler(request: Request):
             ),
         )
 
-    user_country = await userHelper.get_country(user_data["id"])
-    if user_country == "XX":
-        await userHelper.set_country(user_data["id"], player.country[1])
+    if user_data["country"] == "XX":
+        WriteBehind.set_country(user_data["id"], player.country[1])
 
     start_bytes = [
         PacketBuilder.UserID(player.id),
         PacketBuilder.ProtocolVersion(19),
         PacketBuilder.BanchoPrivileges(player.bancho_privs),
-        PacketBuilder.UserPresence(player),
-        PacketBuilder.UserStats(player),
+        player.presence_packet,
+        player.stats_packet,
         PacketBuilder.FriendList(player.friends),
         PacketBuilder.SilenceEnd(player.silence_end if player.silence_end > 0 else 0),
         PacketBuilder.Notification(
@@ -284,31 +372,17 @@ async def main_handler(request: Request):
     if Context.bancho_settings["menu_icon"]:
         start_bytes += PacketBuilder.MainMenuIcon(Context.bancho_settings["menu_icon"])
 
-    if is_tourney and Context.players.get_token(uid=user_data["id"]):
+    start_bytes += Context.players.get_presences_with_stats_snapshot()
+    is_additional_client = bool(is_tourney and Context.players.get_token(uid=user_data["id"]))
+    if is_additional_client:
         logger.klog(f"<{player.name}> Joined kuriso as additional client for origin!")
-        for p in Context.players.get_all_tokens():
-            if p.is_restricted:
-                continue
-
-            start_bytes += bytes(PacketBuilder.UserPresence(p) + PacketBuilder.UserStats(p))
     else:
-        for p in Context.players.get_all_tokens():
-            if p.is_restricted:
-                continue
-
-            start_bytes += bytes(PacketBuilder.UserPresence(p) + PacketBuilder.UserStats(p))
-            p.enqueue(
-                bytes(PacketBuilder.UserPresence(player) + PacketBuilder.UserStats(player)),
-            )
-
-        await userHelper.saveBanchoSession(player.id, request.client.host)
+        player_packets = player.presence_packet + player.stats_packet
+        for p in Context.players.unrestricted_tokens():
+            p.enqueue(player_packets)
 
         Context.players.add_token(player)
-        await Context.redis.set(
-            "ripple:online_users",
-            len(Context.players.get_all_tokens(True)),
-        )
-        logger.klog(f"<{player.name}> Joined kuriso!")
+        WriteBehind.save_session(player.id, request.client.host)
 
     # default channels to join is #osu, #announce and #english
     await asyncio.gather(
@@ -332,6 +406,10 @@ async def main_handler(request: Request):
             "Your account is currently in restricted mode. Please visit kurikku's website for more information.",
         )
 
+    login_timer.mark("join")
+    login_timer.observe()
+    if not is_additional_client:
+        logger.klog(f"<{player.name}> Joined kuriso! {login_timer}")
     Context.stats["osu_versions"].labels(osu_version=osu_version).inc()
     Context.stats["devclient_usage"].labels(host=request.url.netloc).inc()
     return BanchoResponse(start_bytes, player.token)
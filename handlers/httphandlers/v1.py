@@ -28,7 +28,7 @@ async def onlineUsers_handler(_):
     return JSONResponse(
         {
             "status": 200,
-            "result": len(Context.players.get_all_tokens(ignore_tournament_clients=True)),
+            "result": Context.players.get_online_count(),
             "message": "ok",
         },
     )
@@ -15,7 +15,7 @@ def getSystemInfo():
     """
     data = {
         "unix": os.name == "posix",
-        "connectedUsers": len(Context.players.get_all_tokens(ignore_tournament_clients=True)),
+        "connectedUsers": Context.players.get_online_count(),
         "matches": len(Context.matches.items()),
     }
 
@@ -100,7 +100,7 @@ async def reload_settings() -> bool:
 
     channel_info_packets = await asyncio.gather(*tasks)
 
-    for token in Context.players.get_all_tokens():
+    for token in Context.players.all_tokens():
         token.enqueue(main_menu_packet + channel_info_end + b"".join(channel_info_packets))
 
     return True
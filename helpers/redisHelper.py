@@ -0,0 +1,87 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from blob import Context
+from lib import logger
+from objects.constants.GameModes import GameModes
+
+LEADERBOARD_MODES = ("std", "taiko", "ctb", "mania")
+
+
+def leaderboard_key(mode: str, country: str = None) -> str:
+    if country:
+        return f"ripple:leaderboard:{mode}:{country}"
+
+    return f"ripple:leaderboard:{mode}"
+
+
+async def get_leaderboard_positions(
+    user_ids: Iterable[int],
+    modes: Iterable[GameModes],
+) -> List[List[Optional[int]]]:
+    """
+    Positions (from 0, None if user isn't ranked) of every user in every mode by one round trip
+    """
+    user_ids = list(user_ids)
+    keys = [leaderboard_key(GameModes.resolve_to_str(mode)) for mode in modes]
+    if not user_ids or not keys:
+        return [[] for _ in user_ids]
+
+    pipe = Context.redis.pipeline(transaction=False)
+    for user_id in user_ids:
+        for key in keys:
+            pipe.zrevrank(key, str(user_id))
+    positions = await pipe.execute()
+
+    return [positions[ind : ind + len(keys)] for ind in range(0, len(positions), len(keys))]
+
+
+async def remove_from_leaderboards(user_id: int, country: str = None) -> None:
+    """
+    Removes user from global and country leaderboards of every mode in one transaction
+    """
+    pipe = Context.redis.pipeline(transaction=True)
+    for mode in LEADERBOARD_MODES:
+        pipe.zrem(leaderboard_key(mode), str(user_id))
+        if country and country != "xx":
+            pipe.zrem(leaderboard_key(mode, country), str(user_id))
+
+    await pipe.execute()
+
+
+async def apply_sessions(sessions: Dict[Tuple[int, str], bool]) -> None:
+    """
+    Adds (True) and removes (False) bancho sessions by one round trip
+    """
+    pipe = Context.redis.pipeline(transaction=False)
+    for ((user_id, ip), is_added) in sessions.items():
+        if is_added:
+            pipe.sadd(f"peppy:sessions:{user_id}", ip)
+        else:
+            pipe.srem(f"peppy:sessions:{user_id}", ip)
+
+    await pipe.execute()
+
+
+async def delete_keys(*keys: str) -> int:
+    # one DEL for all keys
+    return await Context.redis.delete(*keys)
+
+
+async def unlink_by_pattern(pattern: str, batch_size: int = 1000) -> int:
+    """
+    Deletes keys matching pattern by SCAN + UNLINK batches, so redis isn't blocked
+    like with KEYS on big keyspace (it's shared with LETS and API)
+    """
+    removed = 0
+    batches = 0
+    cursor = 0
+    while True:
+        cursor, keys = await Context.redis.scan(cursor, match=pattern, count=batch_size)
+        if keys:
+            removed += await Context.redis.unlink(*keys)
+            batches += 1
+            if batches % 10 == 0:
+                logger.klog(f"[Redis] Cleanup of {pattern}: {removed} keys removed")
+
+        if not cursor:
+            return removed
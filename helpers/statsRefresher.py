@@ -0,0 +1,87 @@
+import asyncio
+from typing import List, Set, TYPE_CHECKING
+
+from sentry_sdk import capture_exception
+
+from blob import Context
+from config import Config
+from helpers import redisHelper
+from lib import logger
+from objects.Player import get_stats_columns, parse_stats_row
+from objects.constants.GameModes import GameModes
+
+if TYPE_CHECKING:
+    from objects.Player import Player
+
+ALL_MODES = tuple(GameModes)
+
+
+class StatsRefresher:
+    """
+    Collects ids of players, whose stats were changed (LETS events), during short window
+    and refreshes them all by one mysql query and one redis pipeline
+    """
+
+    pending: Set[int] = set()
+    is_scheduled: bool = False
+
+    @classmethod
+    def schedule(cls, user_id: int) -> None:
+        cls.pending.add(user_id)
+        if cls.is_scheduled:
+            return
+
+        cls.is_scheduled = True
+        window = Config.config["stats"]["refresh_window"]
+        asyncio.get_event_loop().call_later(
+            window / 1000,
+            lambda: asyncio.ensure_future(cls.flush()),
+        )
+
+    @classmethod
+    async def flush(cls) -> None:
+        user_ids, cls.pending = cls.pending, set()
+        cls.is_scheduled = False
+
+        tokens = [token for uid in user_ids if (token := Context.players.get_token(uid=uid))]
+        if not tokens:
+            return
+
+        try:
+            await cls.refresh(tokens)
+        except Exception as e:
+            capture_exception(e)
+            logger.elog(f"[StatsRefresher] Can't refresh stats of {len(tokens)} players: {e}")
+
+    @classmethod
+    async def refresh(cls, tokens: List["Player"]) -> None:
+        ids = {f"id_{ind}": token.id for (ind, token) in enumerate(tokens)}
+        rows = await Context.mysql.fetch_all(
+            f"select id, {get_stats_columns(ALL_MODES)} from users_stats "
+            f"where id in ({', '.join(f':{key}' for key in ids)})",
+            ids,
+        )
+        stats_by_id = {row["id"]: parse_stats_row(row, ALL_MODES) for row in rows}
+
+        tokens = [token for token in tokens if token.id in stats_by_id]
+        positions = await redisHelper.get_leaderboard_positions(
+            (token.id for token in tokens), ALL_MODES
+        )
+
+        for (token, token_positions) in zip(tokens, positions):
+            token.apply_stats(stats_by_id[token.id], token_positions)
+
+        # new stats of all refreshed players are sent to everyone by one packet
+        stats_packets = b"".join(
+            token.stats_packet for token in tokens if not token.is_restricted
+        )
+        if stats_packets:
+            for user in Context.players.unrestricted_tokens():
+                user.enqueue(stats_packets)
+
+        # restricted players see only their own stats
+        for token in tokens:
+            if token.is_restricted:
+                token.enqueue(token.stats_packet)
+
+        logger.klog(f"[StatsRefresher] Refreshed stats of {len(tokens)} players")
@@ -7,6 +7,8 @@ from typing import Union, Tuple, List, TYPE_CHECKING, Optional, Mapping
 from objects.constants import Privileges
 from blob import Context
 from lib import logger
+from helpers import redisHelper
+from helpers.writeBehind import WriteBehind
 
 from functools import lru_cache
 
@@ -32,14 +34,13 @@ async def check_login(login: str, password: str, ip: str):
     if not user:
         return False
 
-    user_bancho_session_exist = (
-        (await Context.redis.exists(f"peppy:sessions:{user['id']}"))
-        or (await Context.redis.sismember(f"peppy:sessions:{user['id']}", ip))
-        if ip
-        else False
-    )
-    if user_bancho_session_exist:
-        await Context.redis.srem(f"peppy:sessions:{user['id']}", ip)
+    return await check_login_password(user, password, ip)
+
+
+async def check_login_password(user: Mapping, password: str, ip: str) -> bool:
+    if ip:
+        # drop old bancho session from this ip, queued with other session changes
+        WriteBehind.remove_session(user["id"], ip)
 
     if len(password) != 32:
         return False
@@ -50,6 +51,21 @@ async def check_login(login: str, password: str, ip: str):
     return check_pw(password, db_password)
 
 
+async def get_login_user(login: str) -> Optional[Mapping]:
+    """
+    Everything login needs in one query: credentials, start user data,
+    activated hardware existence and country
+    """
+    safe_login = login.lower().strip().replace(" ", "_")
+    return await Context.mysql.fetch_one(
+        "SELECT u.id, u.username, u.password_md5, u.salt, u.password_version, u.silence_end, "
+        "u.privileges, u.donor_expire, s.country, "
+        "EXISTS(SELECT 1 FROM hw_user h WHERE h.userid = u.id AND h.activated = 1) AS has_hardware "
+        "FROM users u LEFT JOIN users_stats s ON s.id = u.id WHERE u.username_safe = :username_safe",
+        {"username_safe": safe_login},
+    )
+
+
 async def get_start_user(login: str) -> Union[None, Optional[Mapping]]:
     safe_login = login.lower().strip().replace(" ", "_")
 
@@ -129,17 +145,7 @@ async def append_notes(
 async def remove_from_leaderboard(user_id: int) -> bool:
     # Remove the user from global and country leaderboards, for every mode
     country = (await get_country(user_id)).lower()
-    tasks = []
-    for mode in ["std", "taiko", "ctb", "mania"]:
-        # я не буду это трогать, тк подозреваю, что оно там всё хранится в стрингАх
-        tasks.append(Context.redis.zrem(f"ripple:leaderboard:{mode}", str(user_id)))
-        # этож надо было сравнивать длину, когда у нативтайпа всегда будет False, если объект пустой *кхм-кхм*
-        if country and country != "xx":
-            tasks.append(
-                Context.redis.zrem(f"ripple:leaderboard:{mode}:{country}", str(user_id)),
-            )
-
-    await asyncio.gather(*tasks)  # запускаем это в асинхрон, потому что меня не ебёт
+    await redisHelper.remove_from_leaderboards(user_id, country)
     return True
 
 
@@ -154,10 +160,11 @@ async def ban(user_id: int) -> bool:
         },
     )
 
-    # Notify our ban handler about the ban
-    await Context.redis.publish("peppy:ban", str(user_id))
-    # Remove the user from global and country leaderboards
-    await remove_from_leaderboard(user_id)
+    # Notify our ban handler about the ban and remove the user from global and country leaderboards
+    await asyncio.gather(
+        Context.redis.publish("peppy:ban", str(user_id)),
+        remove_from_leaderboard(user_id),
+    )
     return True
 
 
@@ -296,12 +303,13 @@ async def setUserLastOsuVer(user_id: int, osu_ver: str) -> bool:
 
 
 async def saveBanchoSession(user_id: int, ip: str) -> bool:
-    await Context.redis.sadd(f"peppy:sessions:{user_id}", ip)
+    await redisHelper.apply_sessions({(user_id, ip): True})
     return True
 
 
 async def deleteBanchoSession(user_id: int, ip: str) -> bool:
-    await Context.redis.srem(f"peppy:sessions:{user_id}", ip)
+    # goes through the same queue as session saving, so it can't outrun it
+    WriteBehind.remove_session(user_id, ip)
     return True
 
 
@@ -398,10 +406,10 @@ async def changeUsername(
     )
 
     # Empty redis username cache
-    await Context.redis.delete(
+    await redisHelper.delete_keys(
         f"ripple:userid_cache:{old_username.lower().strip().replace(' ', '_')}",
+        f"ripple:change_username_pending:{user_id}",
     )
-    await Context.redis.delete(f"ripple:change_username_pending:{user_id}")
     return True
 
 
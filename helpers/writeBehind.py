@@ -0,0 +1,189 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from sentry_sdk import capture_exception
+
+from blob import Context
+from config import Config
+from helpers import redisHelper
+from lib import logger
+
+
+class WriteBehind:
+    """
+    Non-critical side-effect writes of login/session (hardware log, osu! version,
+    country, bancho sessions). They are coalesced in memory and
+    flushed by batched statements on timer, when too many writes are pending
+    and on shutdown. Failed writes are returned to the queue and retried
+    up to max_retries times.
+    """
+
+    # (uid, mac, unique_id, disk_id) -> count of logins
+    hardware: Dict[Tuple[int, str, str, str], int] = {}
+    osu_versions: Dict[int, str] = {}
+    countries: Dict[int, str] = {}
+    # (uid, ip) -> True to add session, False to remove it; last change wins
+    sessions: Dict[Tuple[int, str], bool] = {}
+    attempts: Dict[Tuple[str, Any], int] = {}  # (queue, key) -> failed flushes
+    is_flush_scheduled: bool = False
+    flush_lock: asyncio.Lock = None  # flushes go one by one, so session changes keep order
+
+    @classmethod
+    def pending_count(cls) -> int:
+        return (
+            len(cls.hardware) + len(cls.osu_versions) + len(cls.countries) + len(cls.sessions)
+        )
+
+    @classmethod
+    def check_size(cls) -> None:
+        if (
+            not cls.is_flush_scheduled
+            and cls.pending_count() >= Config.config["write_behind"]["max_pending"]
+        ):
+            cls.is_flush_scheduled = True
+            asyncio.ensure_future(cls.flush())
+
+    @classmethod
+    def log_hardware(cls, user_id: int, hashes: List[str] = None) -> None:
+        if not hashes or len(hashes) < 5:
+            return  # malformed client hashes
+
+        key = (user_id, hashes[2], hashes[3], hashes[4])
+        cls.hardware[key] = cls.hardware.get(key, 0) + 1
+        cls.check_size()
+
+    @classmethod
+    def set_osu_version(cls, user_id: int, osu_ver: str) -> None:
+        cls.osu_versions[user_id] = osu_ver
+        cls.check_size()
+
+    @classmethod
+    def set_country(cls, user_id: int, country: str) -> None:
+        cls.countries[user_id] = country
+        cls.check_size()
+
+    @classmethod
+    def save_session(cls, user_id: int, ip: str) -> None:
+        cls.sessions[(user_id, ip)] = True
+        cls.check_size()
+
+    @classmethod
+    def remove_session(cls, user_id: int, ip: str) -> None:
+        cls.sessions[(user_id, ip)] = False
+        cls.check_size()
+
+    @classmethod
+    async def flush(cls) -> None:
+        # lock is created on running loop
+        lock = cls.flush_lock = cls.flush_lock or asyncio.Lock()
+        async with lock:
+            cls.is_flush_scheduled = False
+            hardware, cls.hardware = cls.hardware, {}
+            osu_versions, cls.osu_versions = cls.osu_versions, {}
+            countries, cls.countries = cls.countries, {}
+            sessions, cls.sessions = cls.sessions, {}
+
+            batches: List[Tuple[str, Dict, Callable[[Dict], Awaitable]]] = []
+            if hardware:
+                batches.append(("hardware", hardware, cls.write_hardware))
+            if osu_versions:
+                batches.append(
+                    (
+                        "osu_versions",
+                        osu_versions,
+                        lambda values: cls.update_by_id("users", "osuver", values),
+                    )
+                )
+            if countries:
+                batches.append(
+                    (
+                        "countries",
+                        countries,
+                        lambda values: cls.update_by_id("users_stats", "country", values),
+                    )
+                )
+            if sessions:
+                batches.append(("sessions", sessions, redisHelper.apply_sessions))
+
+            if not batches:
+                return
+
+            results = await asyncio.gather(
+                *(write(values) for (_, values, write) in batches),
+                return_exceptions=True,
+            )
+            for ((name, values, _), result) in zip(batches, results):
+                if isinstance(result, Exception):
+                    capture_exception(result)
+                    logger.elog(f"[WriteBehind] Can't flush {len(values)} {name}: {result}")
+                    cls.requeue(name, values)
+                else:
+                    for key in values:
+                        cls.attempts.pop((name, key), None)
+
+    @classmethod
+    def requeue(cls, name: str, values: Dict) -> None:
+        """
+        Returns failed writes to the front of their queue, newer values of the same key win
+        """
+        max_retries = Config.config["write_behind"]["max_retries"]
+        failed = {}
+        for (key, value) in values.items():
+            attempts = cls.attempts.get((name, key), 0) + 1
+            if attempts > max_retries:
+                cls.attempts.pop((name, key), None)
+                logger.elog(
+                    f"[WriteBehind] Dropped {name} write of {key} after {attempts} tries"
+                )
+                continue
+
+            cls.attempts[(name, key)] = attempts
+            failed[key] = value
+
+        pending = getattr(cls, name)
+        if name == "hardware":
+            # login counts are summed, not replaced
+            for (key, count) in pending.items():
+                failed[key] = failed.get(key, 0) + count
+            setattr(cls, name, failed)
+        else:
+            setattr(cls, name, {**failed, **pending})
+
+    @staticmethod
+    async def write_hardware(hardware: Dict[Tuple[int, str, str, str], int]) -> None:
+        rows = []
+        values = {}
+        for (ind, ((uid, mac, unique_id, disk_id), count)) in enumerate(hardware.items()):
+            rows.append(
+                f"(:uid_{ind}, :mac_{ind}, :unique_id_{ind}, :disk_id_{ind}, :count_{ind})"
+            )
+            values.update(
+                {
+                    f"uid_{ind}": uid,
+                    f"mac_{ind}": mac,
+                    f"unique_id_{ind}": unique_id,
+                    f"disk_id_{ind}": disk_id,
+                    f"count_{ind}": count,
+                }
+            )
+
+        await Context.mysql.execute(
+            "INSERT INTO hw_user (userid, mac, unique_id, disk_id, occurencies) "
+            f"VALUES {', '.join(rows)} "
+            "ON DUPLICATE KEY UPDATE occurencies = occurencies + VALUES(occurencies)",
+            values,
+        )
+
+    @staticmethod
+    async def update_by_id(table: str, column: str, new_values: Dict[int, str]) -> None:
+        cases = []
+        values = {}
+        for (ind, (user_id, value)) in enumerate(new_values.items()):
+            cases.append(f"WHEN :id_{ind} THEN :value_{ind}")
+            values.update({f"id_{ind}": user_id, f"value_{ind}": value})
+
+        await Context.mysql.execute(
+            f"UPDATE {table} SET {column} = CASE id {' '.join(cases)} END "
+            f"WHERE id IN ({', '.join(f':id_{ind}' for ind in range(len(new_values)))})",
+            values,
+        )
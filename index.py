@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import sys
+import time
 import traceback
 
 import aioredis
@@ -28,17 +29,40 @@ from irc import IRCStreamsServer
 
 # from lib import AsyncSQLPoolWrapper
 from lib import logger
+from lib.logger import magnitude_fmt_time
+from lib.profiler import PacketProfiler
+from helpers import redisHelper
+from helpers.writeBehind import WriteBehind
 from dotenv import load_dotenv, find_dotenv
 
 from lib.asyncio_run import asyncio_run
 
 
+async def clean_redis():
+    logger.slog("[Redis] Removing old information about redis...")
+    start_time = time.perf_counter_ns()
+    try:
+        await Context.redis.set("ripple:online_users", "0")
+        removed = await redisHelper.unlink_by_pattern("peppy:*")  # sessions are here too
+        logger.slog(
+            f"[Redis] Removed {removed} old keys in "
+            f"{magnitude_fmt_time(time.perf_counter_ns() - start_time)}",
+        )
+    except Exception as e:
+        traceback.print_exc()
+        capture_exception(e)
+        logger.elog("[Redis] initiation data ruined... Check this!")
+
+    await Context.redis.set("peppy:version", Context.version)
+
+
 async def main():
     # load dotenv file
     load_dotenv(find_dotenv())
 
     # Load configuration for our project
     Config.load_config()
+    PacketProfiler.load()
     logger.slog("[Config] Loaded")
 
     # create simple Starlette through uvicorn app
@@ -79,27 +103,8 @@ async def main():
     Context.redis = redis_pool
     logger.slog("[Redis] Connection to Redis established! Well done!")
 
-    logger.slog("[Redis] Removing old information about redis...")
-    try:
-        await Context.redis.set("ripple:online_users", "0")
-        redis_flush_script = """
-local matches = redis.call('KEYS', ARGV[1])
-
-local result = 0
-for _,key in ipairs(matches) do
-    result = result + redis.call('DEL', key)
-end
-
-return result
-"""
-        await Context.redis.eval(redis_flush_script, 1, *"peppy:*")
-        await Context.redis.eval(redis_flush_script, 1, *"peppy:sessions:*")
-    except Exception as e:
-        traceback.print_exc()
-        capture_exception(e)
-        logger.elog("[Redis] initiation data ruined... Check this!")
-
-    await Context.redis.set("peppy:version", Context.version)
+    # old data is removed while rest of kuriso is loading
+    cleanup_task = asyncio.create_task(clean_redis())
 
     logger.wlog("[MySQL] Making connection to MySQL Database...")
     mysql_pool = Database(
@@ -143,12 +148,35 @@ return result
     if Config.config["prometheus"]["enabled"]:
         scheduler.add_job(loops.add_prometheus_stats, "interval", seconds=15)
     scheduler.add_job(loops.add_stats, "interval", seconds=120)
+    scheduler.add_job(
+        loops.flush_channels_info,
+        "interval",
+        seconds=Config.config["channels"]["info_interval"],
+    )
+    scheduler.add_job(
+        loops.flush_online_users,
+        "interval",
+        seconds=Config.config["online_users"]["flush_interval"],
+    )
+    scheduler.add_job(
+        loops.flush_write_behind,
+        "interval",
+        seconds=Config.config["write_behind"]["interval"],
+    )
+    if Config.config["profiling"]["enabled"]:
+        scheduler.add_job(
+            loops.dump_profiling,
+            "interval",
+            seconds=Config.config["profiling"]["dump_interval"],
+        )
 
     # Setup pub/sub listeners for LETS/old admin panel events
     asyncio_run(pubsub_listeners.init())
     asyncio_run(asyncio.start_server(IRCStreamsServer, "127.0.0.1", 6667))
 
     Context.load_motd()
+    # players can't login until old sessions are removed
+    await cleanup_task
     uvicorn.run(
         app,
         host=Config.config["host"]["address"],
@@ -166,13 +194,19 @@ def shutdown(original_handler):
 
         logger.elog("[Server] Awaiting when players will get them packets!")
         attempts = 0
-        while any(len(x.queue) > 0 for x in Context.players.get_all_tokens()):
+        while any(not x.is_queue_empty for x in Context.players.all_tokens()):
             await asyncio.sleep(5)
             attempts += 1
             logger.elog(f"[Server] Attempt {attempts}/3")
             if attempts == 3:
                 break
 
+        PacketProfiler.dump()
+
+        logger.elog("[Server] Flushing pending writes...")
+        await WriteBehind.flush()
+        await loops.flush_online_users()
+
         # Stop redis connection
         logger.elog("[Server] Stopping redis pool...")
         if Context.redis:
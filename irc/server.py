@@ -14,7 +14,6 @@ from helpers import userHelper
 from lib import logger
 from objects.IRCPlayer import IRCPlayer
 from objects.constants import Privileges
-from packets.Builder.index import PacketBuilder
 from objects.BanchoObjects import Message
 
 if TYPE_CHECKING:
@@ -133,13 +132,9 @@ class IRCClient:
             player = IRCPlayer(**start_params)
             Context.players.add_token(player)
 
-        for p in Context.players.get_all_tokens():
-            if p.is_restricted:
-                continue
-
-            p.enqueue(
-                bytes(PacketBuilder.UserPresence(player) + PacketBuilder.UserStats(player)),
-            )
+        player_packets = player.presence_packet + player.stats_packet
+        for p in Context.players.unrestricted_tokens():
+            p.enqueue(player_packets)
 
         await asyncio.gather(
             *[
@@ -0,0 +1,67 @@
+"""
+Sampling cProfile for packet handlers, stats are dumped periodically into rotating .prof files
+(open them with `python -m pstats <file>` or snakeviz)
+"""
+import cProfile
+import os
+import random
+import time
+from typing import Awaitable, Optional
+
+from config import Config
+from lib import logger
+
+
+class PacketProfiler:
+    enabled: bool = False
+    sample_rate: float = 0.0
+    dump_dir: str = ""
+    keep_dumps: int = 0
+
+    profile: Optional[cProfile.Profile] = None
+    is_profiling: bool = False  # cProfile can't be enabled twice
+    samples: int = 0
+
+    @classmethod
+    def load(cls) -> None:
+        profiling = Config.config["profiling"]
+        cls.enabled = profiling["enabled"]
+        cls.sample_rate = profiling["sample_rate"]
+        cls.dump_dir = profiling["dump_dir"]
+        cls.keep_dumps = profiling["keep_dumps"]
+        if cls.enabled:
+            os.makedirs(cls.dump_dir, exist_ok=True)
+            cls.profile = cProfile.Profile()
+
+    @classmethod
+    def should_sample(cls) -> bool:
+        return cls.enabled and not cls.is_profiling and random.random() < cls.sample_rate
+
+    @classmethod
+    async def run(cls, handler: Awaitable) -> None:
+        # NOTE: other coroutines, which are running while handler awaits, are profiled too
+        cls.is_profiling = True
+        cls.profile.enable()
+        try:
+            await handler
+        finally:
+            cls.profile.disable()
+            cls.is_profiling = False
+            cls.samples += 1
+
+    @classmethod
+    def dump(cls) -> None:
+        if not cls.enabled or not cls.samples or cls.is_profiling:
+            return
+
+        path = os.path.join(cls.dump_dir, f"handlers-{int(time.time())}.prof")
+        cls.profile.dump_stats(path)
+        logger.slog(f"[Profiler] Dumped {cls.samples} handler samples to {path}")
+        cls.profile = cProfile.Profile()
+        cls.samples = 0
+
+        dumps = sorted(
+            file for file in os.listdir(cls.dump_dir) if file.startswith("handlers-")
+        )
+        for old_dump in dumps[: max(0, len(dumps) - cls.keep_dumps)]:
+            os.remove(os.path.join(cls.dump_dir, old_dump))
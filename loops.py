@@ -3,7 +3,10 @@ import time
 
 from blob import Context
 from config import Config
+from helpers.writeBehind import WriteBehind
 from lib import logger
+from lib.profiler import PacketProfiler
+from packets.Builder.index import PacketBuilder
 
 LAST_PACKET_TIMEOUT = 240
 
@@ -33,10 +36,40 @@ async def clean_timeouts():
     await asyncio.gather(*tasks)
 
 
+async def flush_channels_info():
+    """
+    Sends member counts of changed public channels to everyone, packets are built once per flush
+    """
+    if not Context.changed_channels:
+        return
+
+    channels_info = b"".join(
+        PacketBuilder.ChannelAvailable(channel)
+        for channel in Context.changed_channels
+        if Context.channels.get(channel.server_name, None) is channel
+    )
+    Context.changed_channels.clear()
+    for user in Context.players.all_tokens():
+        user.enqueue(channels_info)
+
+
+async def flush_online_users():
+    """
+    Online count is changed by every login/logout, but redis gets it once per interval
+    """
+    if not Context.players.online_changed:
+        return
+
+    Context.players.online_changed = False
+    online_users = Context.players.get_online_count()
+    Context.stats["online_users"].set(online_users)
+    await Context.redis.set("ripple:online_users", online_users)
+
+
 async def add_stats():
     if Config.config["stats_enabled"]:
         # start thread
-        online_users = len(Context.players.get_all_tokens(ignore_tournament_clients=True))
+        online_users = Context.players.get_online_count()
         multiplayers_matches = len(Context.matches.items())
 
         await Context.mysql.execute(
@@ -49,7 +82,18 @@ async def add_prometheus_stats():
     """
     That code calls every 15s!
     """
-    online_users = len(Context.players.get_all_tokens(ignore_tournament_clients=True))
+    online_users = Context.players.get_online_count()
     multiplayers_matches = len(Context.matches.items())
     Context.stats["online_users"].set(online_users)
     Context.stats["multiplayer_matches"].set(multiplayers_matches)
+    Context.stats["queued_bytes"].set(
+        sum(user.queue_size for user in Context.players.all_tokens()),
+    )
+
+
+async def flush_write_behind():
+    await WriteBehind.flush()
+
+
+async def dump_profiling():
+    PacketProfiler.dump()
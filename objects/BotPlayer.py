@@ -83,32 +83,24 @@ class BotPlayer(Player):
         return True
 
     async def update_stats(self, selected_mode: GameModes = None) -> bool:
-        for mode in GameModes if not selected_mode else [selected_mode]:
-            # pylint: disable=consider-using-f-string
-            res = await Context.mysql.fetch_one(
-                "select total_score_{0} as total_score, ranked_score_{0} as ranked_score, "
-                "pp_{0} as pp, playcount_{0} as total_plays, avg_accuracy_{0} as accuracy, playtime_{0} as playtime "
-                "from users_stats where id = :id".format(GameModes.resolve_to_str(mode)),
-                {"id": self.id},
-            )
+        modes = tuple(GameModes) if selected_mode is None else (selected_mode,)
+        if not (stats := await self.fetch_stats(modes)):
+            return False
 
-            if not res:
-                logger.elog(
-                    f"[Player/{self.name}] Can't parse stats for {GameModes.resolve_to_str(mode)}",
-                )
-                return False
+        for mode in modes:
+            self.stats[mode].update(**{**stats[mode], **{"leaderboard_rank": 0}})
 
-            self.stats[mode].update(**{**res, **{"leaderboard_rank": 0}})
+        self.invalidate_packets()
         return True
 
     async def logout(self) -> None:
         # leave channels
-        for (_, chan) in Context.channels.items():
-            if self.id in chan.users:
-                await chan.leave_channel(self)
+        for chan in list(self.joined_channels):
+            await chan.leave_channel(self)
 
         if not self.is_tourneymode:
-            for p in Context.players.get_all_tokens():
+            # copy, because tokens can login/logout while receiver awaits
+            for p in tuple(Context.players.all_tokens()):
                 await p.on_another_user_logout(self)
 
         Context.players.delete_token(self)
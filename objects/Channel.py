@@ -1,9 +1,10 @@
-from typing import List, Union
+from typing import Dict, Union
 
 from lib import logger
 
 from objects.constants.KurikkuPrivileges import KurikkuPrivileges
 from blob import Context
+from packets.Builder.index import PacketBuilder
 
 from typing import TYPE_CHECKING
 
@@ -22,7 +23,8 @@ class Channel:
         public_write: bool = False,
         temp_channel: bool = False,
     ):
-        self.users: List[Union["Player", "IRCPlayer"]] = []
+        # ordered set of joined users (dict keys), users also keep set of joined channels
+        self.users: Dict[Union["Player", "IRCPlayer"], None] = {}
         # for use this client should be like #osu, #admin, #osu, #specatator, #multiplayer, #lobby and etc.
         # server can store it like #banana, #spec_<id>, #multi_<id> and etc.
         self.server_name = server_name
@@ -49,14 +51,41 @@ class Channel:
             or (privs & KurikkuPrivileges.ReplayModerator) == KurikkuPrivileges.ReplayModerator,
         )
 
+    async def notify_members_changed(
+        self, p: Union["Player", "IRCPlayer"], joined: bool
+    ) -> None:
+        if self.temp_channel:
+            receivers = self.users
+        else:
+            # osu! clients get member counts of public channels from loop (loops.flush_channels_info),
+            # only irc clients need every join/leave and p gets new member count right now
+            Context.changed_channels.add(self)
+            p.enqueue(PacketBuilder.ChannelAvailable(self))
+            receivers = Context.players.irc_tokens()
+
+        # receivers can suspend in handlers, while somebody else joins/leaves
+        for receiver in tuple(receivers):
+            if joined:
+                await receiver.on_channel_another_user_join(p.name, channel=self)
+            else:
+                await receiver.on_channel_another_user_leave(p.name, channel=self)
+
     async def send_message(self, from_id: int, message: "Message") -> bool:
         message.to = self.name
-        # handle channel message
-        for receiver in self.users:
+        # handle channel message, osu! clients get the same bytes, so build packet once
+        packet = None
+        # copy, because members can join/leave while irc/tourney receiver awaits
+        for receiver in tuple(self.users):
             if receiver.id == from_id:
                 continue  # ignore ourself
 
-            await receiver.on_message(from_id, message, server_name=self.server_name)
+            if not receiver.can_share_packets:
+                await receiver.on_message(from_id, message, server_name=self.server_name)
+                continue
+
+            if packet is None:
+                packet = PacketBuilder.BuildMessage(from_id, message)
+            receiver.enqueue(packet)
 
         return True
 
@@ -74,16 +103,12 @@ class Channel:
 
         # enqueue join channel
         await p.on_channel_join(self.name, self.server_name)
-        self.users.append(p)
+        self.users[p] = None
+        p.joined_channels.add(self)
         logger.klog(f"<{p.name}> Joined to {self.server_name}")
 
         # now we need update channel stats
-        if self.temp_channel:
-            receivers = self.users
-        else:
-            receivers = Context.players.get_all_tokens()
-        for receiver in receivers:
-            await receiver.on_channel_another_user_join(p.name, channel=self)
+        await self.notify_members_changed(p, joined=True)
         return True
 
     async def leave_channel(self, p: Union["Player", "IRCPlayer"]) -> bool:
@@ -92,16 +117,12 @@ class Channel:
 
         # enqueue leave channel
         await p.on_channel_leave(self.name, self.server_name)
-        self.users.pop(self.users.index(p))
+        del self.users[p]
+        p.joined_channels.discard(self)
         logger.klog(f"<{p.name}> Parted from {self.server_name} {len(self.users)}")
 
         # now we need update channel stats
-        if self.temp_channel:
-            receivers = self.users
-        else:
-            receivers = Context.players.get_all_tokens()
-        for receiver in receivers:
-            await receiver.on_channel_another_user_leave(p.name, channel=self)
+        await self.notify_members_changed(p, joined=False)
 
         if len(self.users) < 1 and self.temp_channel:
             # clean channel because all left and channel is temp(for multi lobby or spectator)
@@ -60,6 +60,10 @@ class IRCPlayer(Player):
     def is_queue_empty(self) -> bool:
         return True
 
+    @property
+    def can_share_packets(self) -> bool:
+        return False  # messages are formatted for irc
+
     async def parse_country(self, *_) -> bool:
         donor_location: str = (
             await Context.mysql.fetch_one(
@@ -77,20 +81,16 @@ class IRCPlayer(Player):
 
     async def logout(self) -> None:
         if not self.is_tourneymode:
-            await Context.redis.set(
-                "ripple:online_users",
-                len(Context.players.get_all_tokens(True)),
-            )
             if self.ip:
                 await userHelper.deleteBanchoSession(self.id, self.ip)
 
         # leave channels
-        for (_, chan) in Context.channels.items():
-            if self.id in chan.users:
-                await chan.leave_channel(self)
+        for chan in list(self.joined_channels):
+            await chan.leave_channel(self)
 
         if not self.is_tourneymode:
-            for p in Context.players.get_all_tokens():
+            # copy, because tokens can login/logout while receiver awaits
+            for p in tuple(Context.players.all_tokens()):
                 await p.on_another_user_logout(self)
 
         self.irc.writer.close()
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import random
 import time
@@ -6,7 +7,9 @@ from typing import TYPE_CHECKING
 
 from blob import Context
 from bot.bot import CrystalBot
+from config import Config
 from objects.Channel import Channel
+from objects.ScoreRelay import ScoreRelay
 from objects.constants.GameModes import GameModes
 from objects.constants.Modificators import Mods
 from objects.constants.Slots import SlotStatus, SlotTeams
@@ -116,6 +119,8 @@ class Match:
         "timer_force",
         "timer_runned",
         "vinse_id",
+        "update_pending",
+        "score_relay",
     )
 
     def __init__(
@@ -160,6 +165,8 @@ class Match:
         self.timer_runned = False
 
         self.vinse_id = 0
+        self.update_pending = False
+        self.score_relay = ScoreRelay(self.slots)
 
     @property
     def is_freemod(self) -> bool:
@@ -210,19 +217,44 @@ class Match:
         return True
 
     async def update_match(self) -> bool:
-        asked = []
+        """
+        Sends match state to its users and lobby. With coalesced updates state is sent
+        once per update_interval, no matter how many times match was changed in it
+        """
+        multiplayer = Config.config.get("multiplayer", {})
+        if not multiplayer.get("coalesce_updates", False):
+            return self.send_update()
+
+        if not self.update_pending:
+            self.update_pending = True
+            asyncio.get_event_loop().call_later(
+                multiplayer["update_interval"] / 1000,
+                self.flush_update,
+            )
+
+        return True
+
+    def flush_update(self) -> None:
+        self.update_pending = False
+        if Context.matches.get(self.id, None) is not self:
+            return  # match was disbanded
+
+        self.send_update()
+
+    def send_update(self) -> bool:
+        asked = set()
         info_packet = PacketBuilder.UpdateMatch(self)
         for user in self.channel.users:
-            asked.append(user.id)
+            asked.add(user.id)
             user.enqueue(info_packet)
 
-        info_packet_for_foreign = PacketBuilder.UpdateMatch(self, False)
-        for user in Context.players.get_all_tokens(ignore_tournament_clients=True):
-            if not user.is_in_lobby:
-                continue
+        info_packet_for_foreign = None  # built only if somebody is in lobby
+        for user in Context.players.lobby_tokens():
             if user.id in asked:
                 continue  # we send this packet already
 
+            if info_packet_for_foreign is None:
+                info_packet_for_foreign = PacketBuilder.UpdateMatch(self, False)
             user.enqueue(info_packet_for_foreign)
 
         return True
@@ -274,6 +306,7 @@ class Match:
             pl_slot.mods = Mods.NoMod
             pl_slot.team = SlotTeams.Neutral
 
+        self.score_relay.remove(player)
         await self.channel.leave_channel(player)  # try to part user
 
         if self.in_progress and self.need_load > 0:  # probably that user not loaded at all
@@ -285,9 +318,7 @@ class Match:
             # опа ча, игроки поливали, дизбендим матч
             Context.matches.pop(self.id)  # bye match
             info_packet = PacketBuilder.DisbandMatch(self)
-            for user in Context.players.get_all_tokens(ignore_tournament_clients=True):
-                if not user.is_in_lobby:
-                    continue
+            for user in Context.players.lobby_tokens():
                 user.enqueue(info_packet)
         else:
             # case when host leaves the lobby
@@ -393,6 +424,7 @@ class Match:
                 dudes_who_ready_to_play.append(slot.token)
 
         self.in_progress = True
+        self.score_relay.start()
         match_start_packet = PacketBuilder.InitiateStartMatch(self)
         for dude in dudes_who_ready_to_play:
             # enqueue MatchStart
@@ -417,6 +449,7 @@ class Match:
         if not self.in_progress:
             return False
 
+        self.score_relay.stop()  # playing players get unread frames before abort
         for slot in self.slots_with_status(SlotStatus.Playing):
             slot.status = SlotStatus.NotReady
             slot.failed = True
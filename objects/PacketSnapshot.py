@@ -0,0 +1,35 @@
+from typing import Callable, Dict, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from objects.Player import Player
+
+
+class PacketSnapshot:
+    """
+    Server-wide cache with encoded packets of every visible player.
+    Joined blob is rebuilt only after some entry was changed.
+    """
+
+    __slots__ = ("encoder", "packets", "blob")
+
+    def __init__(self, encoder: Callable[["Player"], bytes]):
+        self.encoder = encoder
+        self.packets: Dict["Player", bytes] = {}
+        self.blob: Optional[bytes] = b""
+
+    def __len__(self) -> int:
+        return len(self.packets)
+
+    def put(self, player: "Player") -> None:
+        self.packets[player] = self.encoder(player)
+        self.blob = None
+
+    def remove(self, player: "Player") -> None:
+        if self.packets.pop(player, None) is not None:
+            self.blob = None
+
+    def get_blob(self) -> bytes:
+        if self.blob is None:
+            self.blob = b"".join(self.packets.values())
+
+        return self.blob
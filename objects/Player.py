@@ -1,12 +1,13 @@
 import asyncio
 import time
-from typing import Optional, Union, List, Dict
+from functools import lru_cache
+from typing import Optional, Union, List, Dict, Mapping, Set, Tuple
 import uuid
 import aiohttp
 
 from blob import Context
 from config import Config
-from helpers import userHelper
+from helpers import userHelper, redisHelper
 from lib import logger
 from objects.constants import Privileges, Countries
 from objects.constants.BanchoRanks import BanchoRanks
@@ -18,6 +19,7 @@ from objects.constants.PresenceFilter import PresenceFilter
 
 from packets.Builder.index import PacketBuilder
 from objects.Channel import Channel
+from objects.SpectatorRelay import SpectatorRelay
 
 from typing import TYPE_CHECKING
 
@@ -31,6 +33,38 @@ if TYPE_CHECKING:
 # but i forgot if class has __slots__ __dict__ is unavailable, sadly ;-;
 
 
+# users_stats column (without mode suffix) -> StatsMode field
+STATS_COLUMNS = (
+    ("total_score", "total_score"),
+    ("ranked_score", "ranked_score"),
+    ("pp", "pp"),
+    ("playcount", "total_plays"),
+    ("avg_accuracy", "accuracy"),
+    ("playtime", "playtime"),
+)
+
+
+@lru_cache(maxsize=None)
+def get_stats_columns(modes: Tuple[GameModes, ...]) -> str:
+    return ", ".join(
+        f"{column}_{mode} as {field}_{mode}"
+        for mode in map(GameModes.resolve_to_str, modes)
+        for (column, field) in STATS_COLUMNS
+    )
+
+
+def parse_stats_row(
+    row: Mapping, modes: Tuple[GameModes, ...]
+) -> Dict[GameModes, "TypedStats"]:
+    return {
+        mode: {
+            field: row[f"{field}_{GameModes.resolve_to_str(mode)}"]
+            for (_, field) in STATS_COLUMNS
+        }
+        for mode in modes
+    }
+
+
 class StatsMode:
     __slots__ = (
         "game_mode",
@@ -96,6 +130,11 @@ class Player:
         is_bot: bool = False,
         ip: str = "",
     ):
+        # encoded UserPresence/UserStats packets, built on first request and dropped
+        # when something they depend on is changed (see invalidate_packets)
+        self._presence_packet: Optional[bytes] = None
+        self._stats_packet: Optional[bytes] = None
+
         self.token: str = self.generate_token()
         self.id = user_id
         self.name = user_name
@@ -108,8 +147,14 @@ class Player:
         }  # setup dictionary with stats
         self.pr_status: Status = Status()
 
+        self.joined_channels: Set[Channel] = set()
+
         self.spectators: List[Player] = []
         self.spectating: Optional[Player] = None
+        # frames for our spectators, they pull them on enqueue and dequeue
+        self.spectator_relay = SpectatorRelay(
+            Config.config.get("queue", {}).get("spectator_max_size", 0),
+        )
 
         self.country = (0, "XX")
         self.location = (0.0, 0.0)
@@ -126,7 +171,10 @@ class Player:
 
         self._match: Optional["Match"] = None
 
-        self.queue = bytes()  # main thing
+        # main thing, packets are joined only on dequeue
+        self.queue: List[bytes] = []
+        self.queue_size = 0
+        self.queue_overflowed = False
         self.login_time = int(time.time())
         self.last_packet_unix = int(time.time())
 
@@ -146,6 +194,93 @@ class Player:
     def match(self):
         return self._match
 
+    @property
+    def privileges(self) -> int:
+        return self._privileges
+
+    @privileges.setter
+    def privileges(self, value: int) -> None:
+        self._privileges = value
+        self.invalidate_packets()
+        Context.players.privileges_changed(self)
+
+    @property
+    def is_in_lobby(self) -> bool:
+        return self._is_in_lobby
+
+    @is_in_lobby.setter
+    def is_in_lobby(self, value: bool) -> None:
+        self._is_in_lobby = value
+        Context.players.lobby_changed(self)
+
+    @property
+    def selected_game_mode(self) -> GameModes:
+        return self._selected_game_mode
+
+    @selected_game_mode.setter
+    def selected_game_mode(self, value: GameModes) -> None:
+        self._selected_game_mode = value
+        self.invalidate_packets()
+
+    @property
+    def stats(self) -> Dict[GameModes, StatsMode]:
+        return self._stats
+
+    @stats.setter
+    def stats(self, value: Dict[GameModes, StatsMode]) -> None:
+        self._stats = value
+        self.invalidate_packets()
+
+    @property
+    def pr_status(self) -> Status:
+        return self._pr_status
+
+    @pr_status.setter
+    def pr_status(self, value: Status) -> None:
+        self._pr_status = value
+        self.invalidate_packets()
+
+    @property
+    def country(self) -> Tuple[int, str]:
+        return self._country
+
+    @country.setter
+    def country(self, value: Tuple[int, str]) -> None:
+        self._country = value
+        self.invalidate_packets()
+
+    @property
+    def location(self) -> Tuple[float, float]:
+        return self._location
+
+    @location.setter
+    def location(self, value: Tuple[float, float]) -> None:
+        self._location = value
+        self.invalidate_packets()
+
+    @property
+    def presence_packet(self) -> bytes:
+        if self._presence_packet is None:
+            self._presence_packet = PacketBuilder.UserPresence(self)
+
+        return self._presence_packet
+
+    @property
+    def stats_packet(self) -> bytes:
+        if self._stats_packet is None:
+            self._stats_packet = PacketBuilder.UserStats(self)
+
+        return self._stats_packet
+
+    def invalidate_packets(self) -> None:
+        """
+        Must be called after in-place changes of pr_status or stats,
+        assignments of privileges/country/location/game mode call it by themselves
+        """
+        self._presence_packet = None
+        self._stats_packet = None
+        Context.players.presence_changed(self)
+
     @property
     def get_formatted_chatlog(self):
         return "\n".join(
@@ -157,6 +292,17 @@ class Player:
     def silenced(self) -> bool:
         return self.silence_end > 0
 
+    @property
+    def is_queue_empty(self) -> bool:
+        return not self.queue
+
+    @property
+    def can_share_packets(self) -> bool:
+        """
+        True if on_message just enqueues BuildMessage packet, so broadcasts can enqueue one prebuilt packet
+        """
+        return True
+
     @property
     def safe_name(self) -> str:
         return self.name.lower().strip().replace(" ", "_")
@@ -218,15 +364,17 @@ class Player:
 
         return True
 
-    async def parse_country(self, ip: str) -> bool:
+    async def parse_country(self, ip: str, donor_country: str = None) -> bool:
         if self.privileges & Privileges.USER_DONOR:
             # we need to remember donor have locked location
-            donor_location: str = (
-                await Context.mysql.fetch_one(
-                    "select country from users_stats where id = :id",
-                    {"id": self.id},
-                )
-            )["country"].upper()
+            if not donor_country:
+                donor_country = (
+                    await Context.mysql.fetch_one(
+                        "select country from users_stats where id = :id",
+                        {"id": self.id},
+                    )
+                )["country"]
+            donor_location = donor_country.upper()
             self.country = (
                 Countries.get_country_id(donor_location),
                 donor_location,
@@ -271,43 +419,53 @@ class Player:
         self.location = (float(loc[0]), float(loc[1]))
         return True
 
-    async def update_stats(self, selected_mode: GameModes = None) -> bool:
-        tasks = []
-        for mode in GameModes if not selected_mode else [selected_mode]:
-            # pylint: disable=consider-using-f-string
-            tasks.append(
-                Context.mysql.fetch_one(
-                    "select total_score_{0} as total_score, ranked_score_{0} as ranked_score, "
-                    "pp_{0} as pp, playcount_{0} as total_plays, avg_accuracy_{0} as accuracy, playtime_{0} as playtime "
-                    "from users_stats where id = :id".format(GameModes.resolve_to_str(mode)),
-                    {"id": self.id},
-                ),
-            )
+    async def fetch_stats(
+        self,
+        modes: Tuple[GameModes, ...],
+    ) -> Optional[Dict[GameModes, "TypedStats"]]:
+        """
+        Stats of all given modes by one query
+        """
+        stats = await Context.mysql.fetch_one(
+            f"select {get_stats_columns(modes)} from users_stats where id = :id",
+            {"id": self.id},
+        )
+        if not stats:
+            logger.elog(f"[Player/{self.name}] Can't parse stats")
+            return None
 
-        res = await asyncio.gather(*tasks)
-        for ind, task in enumerate(res):
-            gm = GameModes(ind)
-            if not task:
-                logger.elog(
-                    f"[Player/{self.name}] Can't parse stats for {GameModes.resolve_to_str(gm)}",
-                )
-                return False
+        return parse_stats_row(stats, modes)
 
-            position = await Context.redis.zrevrank(
-                f"ripple:leaderboard:{GameModes.resolve_to_str(gm)}",
-                str(self.id),
+    def apply_stats(
+        self,
+        stats: Dict[GameModes, "TypedStats"],
+        positions: List[Optional[int]],
+    ) -> None:
+        """
+        Updates stats by values from db and leaderboard positions (in order of stats modes)
+        """
+        for ((mode, mode_stats), position) in zip(stats.items(), positions):
+            # position is 0-based, None - user isn't on leaderboard
+            self.stats[mode].update(
+                **{
+                    **mode_stats,
+                    **{"leaderboard_rank": int(position) + 1 if position is not None else 0},
+                }
             )
 
-            self.stats[gm].update(
-                **{**task, **{"leaderboard_rank": int(position) + 1 if position else 0}}
-            )
+        self.invalidate_packets()
+
+    async def update_stats(self, selected_mode: GameModes = None) -> bool:
+        modes = tuple(GameModes) if selected_mode is None else (selected_mode,)
+        if not (stats := await self.fetch_stats(modes)):
+            return False
+
+        (positions,) = await redisHelper.get_leaderboard_positions((self.id,), modes)
+        self.apply_stats(stats, positions)
+        return True
 
     async def logout(self) -> None:
         if not self.is_tourneymode:
-            await Context.redis.set(
-                "ripple:online_users",
-                len(Context.players.get_all_tokens(True)),
-            )
             if self.ip:
                 await userHelper.deleteBanchoSession(self.id, self.ip)
         # logic
@@ -319,12 +477,12 @@ class Player:
             await self.spectating.remove_spectator(self)
 
         # leave channels
-        for (_, chan) in Context.channels.items():
-            if self.id in chan.users:
-                await chan.leave_channel(self)
+        for chan in list(self.joined_channels):
+            await chan.leave_channel(self)
 
         if not self.is_tourneymode:
-            for p in Context.players.get_all_tokens():
+            # copy, because tokens can login/logout while receiver awaits
+            for p in tuple(Context.players.all_tokens()):
                 await p.on_another_user_logout(self)
 
         Context.players.delete_token(self)
@@ -363,7 +521,7 @@ class Player:
 
         # Send silenced packet to everyone else
         user_silenced = PacketBuilder.UserSilenced(self.id)
-        for user in Context.players.get_all_tokens():
+        for user in Context.players.all_tokens():
             user.enqueue(user_silenced)
 
         return True
@@ -444,6 +602,7 @@ class Player:
 
             Context.channels[spec_chan_name] = spec
             await spec.join_channel(self)
+            c = spec
 
         if not await c.join_channel(new_spec):
             logger.elog(f"{self.name} failed to join in {spec_chan_name} spectator channel!")
@@ -455,6 +614,7 @@ class Player:
             new_spec.enqueue(PacketBuilder.FellowSpectatorJoined(spectator.id))
 
         self.spectators.append(new_spec)
+        self.spectator_relay.add_spectator(new_spec)
         new_spec.spectating = self
 
         self.enqueue(PacketBuilder.SpectatorJoined(new_spec.id))
@@ -464,6 +624,8 @@ class Player:
     async def remove_spectator(self, old_spec: "Player") -> bool:
         spec_chan_name = f"#spec_{self.id}"
         self.spectators.remove(old_spec)  # attempt to remove old player from array
+        old_spec.pull_relay_frames()  # frames came before SpectatorLeft/channel leave
+        self.spectator_relay.remove_spectator(old_spec)
         old_spec.spectating = None
 
         spec_chan: Channel = Context.channels.get(spec_chan_name)
@@ -482,6 +644,8 @@ class Player:
 
     async def remove_hidden_spectator(self, old_spec: "Player") -> bool:
         self.spectators.remove(old_spec)  # attempt to remove old player from array
+        old_spec.pull_relay_frames()  # frames came before SpectatorLeft/channel leave
+        self.spectator_relay.remove_spectator(old_spec)
         old_spec.spectating = None
 
         self.enqueue(PacketBuilder.SpectatorLeft(old_spec.id))
@@ -528,13 +692,62 @@ class Player:
         """
         return self.enqueue(PacketBuilder.PartChannel(channel_name))
 
+    def pull_relay_frames(self) -> None:
+        """
+        Moves unread frames of spectated host and of running match into queue,
+        so they keep their order with packets which are enqueued after them
+        """
+        if self.spectating and (frames := self.spectating.spectator_relay.read(self)):
+            self.queue.append(frames)
+            self.queue_size += len(frames)
+
+        if self.match and (scores := self.match.score_relay.read(self)):
+            self.queue.append(scores)
+            self.queue_size += len(scores)
+
     def enqueue(self, b: bytes) -> None:
-        self.queue += b
+        if not b:
+            return
+
+        self.pull_relay_frames()
+        queue_config = Config.config.get("queue", {})
+        max_size = queue_config.get("max_size", 0)
+        if max_size and self.queue_size + len(b) > max_size:
+            self.on_queue_overflow(queue_config.get("overflow_policy", "kick"))
+            return
+
+        self.queue.append(b)
+        self.queue_size += len(b)
+
+    def on_queue_overflow(self, policy: str) -> None:
+        if self.queue_overflowed:
+            return  # already handled, waiting for kick/next poll
+
+        self.queue_overflowed = True
+        Context.stats["queue_overflows"].labels(policy=policy).inc()
+        if policy != "kick":
+            logger.wlog(
+                f"[Player/{self.name}] queue is overflowed ({self.queue_size} bytes), dropping packets",
+            )
+            return
+
+        # client can't get all of that anyway, he needs to login again
+        self.queue.clear()
+        self.queue_size = 0
+        asyncio.ensure_future(
+            self.kick(
+                "Your client didn't receive data from the server for too long. Please login again.",
+                reason="queue overflow",
+            ),
+        )
 
     def dequeue(self) -> Optional[bytes]:
+        self.pull_relay_frames()
         if self.queue:
-            data = self.queue
-            self.queue = bytes()
+            data = self.queue[0] if len(self.queue) == 1 else b"".join(self.queue)
+            self.queue.clear()
+            self.queue_size = 0
+            self.queue_overflowed = False
             return data
 
         return b""
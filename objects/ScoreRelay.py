@@ -0,0 +1,82 @@
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from objects.constants.Slots import SlotStatus
+
+if TYPE_CHECKING:
+    from objects.Multiplayer import Slot
+    from objects.Player import Player
+
+
+class ScoreRelay:
+    """
+    Latest score frame of every slot in running match.
+    Frame packet is stored once per slot (latest frame wins) and every playing player
+    reads frames, which were updated since his previous read, on enqueue/dequeue.
+    Only players in Playing slots are readers: slot must be finished (see `finish`)
+    before it leaves Playing, then player gets frames which were pushed while he played.
+    """
+
+    __slots__ = ("slots", "slot_by_token", "frames", "versions", "version", "cursors", "cache")
+
+    def __init__(self, slots: List["Slot"]):
+        self.slots = slots
+        self.slot_by_token: Dict["Player", int] = {}
+        self.frames: List[bytes] = [b""] * len(slots)
+        self.versions: List[int] = [0] * len(slots)  # version of last frame in slot
+        self.version = 0
+        self.cursors: Dict["Player", int] = {}  # last version, which was read by player
+        self.cache: Dict[int, bytes] = {}  # cursor -> frames after it, players often share it
+
+    def start(self) -> None:
+        self.stop()
+        for (ind, slot) in enumerate(self.slots):
+            if slot.status == SlotStatus.Playing:
+                self.slot_by_token[slot.token] = ind
+                self.cursors[slot.token] = self.version
+
+    def stop(self) -> None:
+        for token in tuple(self.cursors):
+            self.finish(token)
+
+        self.slot_by_token.clear()
+        self.cursors.clear()
+        self.cache.clear()
+        self.frames = [b""] * len(self.slots)
+
+    def finish(self, token: "Player") -> None:
+        """
+        Moves unread frames into player's queue and stops relaying frames to him,
+        his slot id is kept, so frames which he still sends are relayed to others
+        """
+        if frames := self.read(token):
+            token.enqueue(frames)
+        self.cursors.pop(token, None)
+
+    def remove(self, token: "Player") -> None:
+        self.finish(token)
+        self.slot_by_token.pop(token, None)
+
+    def get_slot_id(self, token: "Player") -> Optional[int]:
+        return self.slot_by_token.get(token, None)
+
+    def push(self, slot_id: int, packet: bytes) -> None:
+        self.version += 1
+        self.frames[slot_id] = packet
+        self.versions[slot_id] = self.version
+        self.cache.clear()
+
+    def read(self, token: "Player") -> bytes:
+        cursor = self.cursors.get(token, None)
+        if cursor is None or cursor == self.version:
+            return b""
+
+        self.cursors[token] = self.version
+        if (data := self.cache.get(cursor, None)) is None:
+            data = b"".join(
+                frame
+                for (frame, version) in zip(self.frames, self.versions)
+                if version > cursor
+            )
+            self.cache[cursor] = data
+
+        return data
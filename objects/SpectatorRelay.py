@@ -0,0 +1,88 @@
+from collections import deque
+from typing import Deque, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from objects.Player import Player
+
+
+class SpectatorRelay:
+    """
+    Shared buffer with spectator frames of one host.
+    Frame packet is appended once and every spectator keeps his own read cursor,
+    so spectator's dequeue is just slice of that buffer.
+    Spectator moves unread frames to his queue before any other packet is enqueued
+    (Player.pull_relay_frames), so frames keep their order with other packets.
+    Offsets are absolute (from the first frame ever), buffer keeps only [base; base + len(buffer)).
+    """
+
+    __slots__ = ("buffer", "base", "frames", "cursors", "max_size")
+
+    def __init__(self, max_size: int = 0):
+        self.buffer = bytearray()
+        self.base = 0
+        self.frames: Deque[int] = deque()  # start offsets of frames, that are still in buffer
+        self.cursors: Dict["Player", int] = {}
+        self.max_size = max_size  # 0 - no limit
+
+    @property
+    def end(self) -> int:
+        return self.base + len(self.buffer)
+
+    def add_spectator(self, spectator: "Player") -> None:
+        # new spectator gets only frames which will be sent after join
+        self.cursors[spectator] = self.end
+
+    def remove_spectator(self, spectator: "Player") -> None:
+        self.cursors.pop(spectator, None)
+        self.trim()
+
+    def push(self, packet: bytes) -> None:
+        if not self.cursors:
+            return
+
+        self.frames.append(self.end)
+        self.buffer += packet
+
+        if self.max_size and len(self.buffer) > self.max_size:
+            # someone doesn't poll frames, drop the oldest frames, but keep the last one
+            end = self.end
+            while len(self.frames) > 1 and end - self.frames[0] > self.max_size:
+                self.frames.popleft()
+
+            first_frame = self.frames[0]
+            for (spectator, cursor) in self.cursors.items():
+                if cursor < first_frame:
+                    self.cursors[spectator] = first_frame
+
+            self.trim(force=True)
+
+    def read(self, spectator: "Player") -> bytes:
+        cursor = self.cursors.get(spectator, None)
+        end = self.end
+        if cursor is None or cursor == end:
+            return b""
+
+        self.cursors[spectator] = end
+        # one copy of the tail, view is released before trim resizes buffer
+        with memoryview(self.buffer) as view:
+            data = view[cursor - self.base :].tobytes()
+        self.trim()
+        return data
+
+    def trim(self, force: bool = False) -> None:
+        """
+        Cut frames which were read by all spectators
+        """
+        low = min(self.cursors.values(), default=self.end)
+        consumed = low - self.base
+        if consumed == 0:
+            return
+
+        # cut only big enough part, to not move buffer on every read
+        if not force and low != self.end and consumed < len(self.buffer) // 2:
+            return
+
+        del self.buffer[:consumed]
+        self.base = low
+        while self.frames and self.frames[0] < low:
+            self.frames.popleft()
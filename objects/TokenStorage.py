@@ -1,4 +1,6 @@
-from typing import Union, TYPE_CHECKING, Dict, List
+from typing import Union, TYPE_CHECKING, Dict, Iterable, List, Set
+
+from objects.PacketSnapshot import PacketSnapshot
 
 if TYPE_CHECKING:
     from objects.Player import Player
@@ -7,12 +9,38 @@ if TYPE_CHECKING:
 
 
 class TokenStorage:
-    __slots__ = ("store_by_token", "store_by_id", "store_by_name")
+    __slots__ = (
+        "store_by_token",
+        "store_by_id",
+        "store_by_name",
+        "store_by_client_token",
+        "owner_by_token",
+        "in_lobby",
+        "unrestricted",
+        "irc_clients",
+        "presences",
+        "presences_with_stats",
+        "changed_presences",
+        "online_changed",
+    )
 
     def __init__(self):
         self.store_by_token: Dict[str, Union["Player", "IRCPlayer"]] = {}
         self.store_by_id: Dict[int, Union["Player", "IRCPlayer"]] = {}
         self.store_by_name: Dict[str, Union["Player", "IRCPlayer"]] = {}
+        # every connected client by token: players and additional clients of tourney managers
+        self.store_by_client_token: Dict[str, Union["Player", "IRCPlayer"]] = {}
+        self.owner_by_token: Dict[str, "TourneyPlayer"] = {}  # additional client -> manager
+        # live views, updated on add/delete and when player changes lobby state/privileges
+        self.in_lobby: Set[Union["Player", "IRCPlayer"]] = set()  # without tournament clients
+        self.unrestricted: Set[Union["Player", "IRCPlayer"]] = set()
+        self.irc_clients: Set["IRCPlayer"] = set()  # with additional tournament clients
+
+        # prebuilt packets of all unrestricted players (without tournament clients)
+        self.presences = PacketSnapshot(lambda p: p.presence_packet)
+        self.presences_with_stats = PacketSnapshot(lambda p: p.presence_packet + p.stats_packet)
+        self.changed_presences: Set["Player"] = set()
+        self.online_changed = False  # online count differs from value in redis
 
     def add_token(self, player: "Player") -> bool:
         if (
@@ -23,10 +51,40 @@ class TokenStorage:
             return False
 
         self.store_by_token[player.token] = player
+        self.store_by_client_token[player.token] = player
         self.store_by_id[player.id] = player
         self.store_by_name[player.safe_name] = player
+        self.changed_presences.add(player)
+        self.online_changed = True
+        self.lobby_changed(player)
+        self.privileges_changed(player)
+        if hasattr(player, "irc"):
+            self.irc_clients.add(player)
         return True
 
+    def add_additional_token(self, manager: "TourneyPlayer", client: "Player") -> None:
+        self.store_by_client_token[client.token] = client
+        self.owner_by_token[client.token] = manager
+        self.privileges_changed(client)
+        if hasattr(client, "irc"):
+            self.irc_clients.add(client)
+
+    def delete_additional_token(self, token: str) -> None:
+        if client := self.store_by_client_token.pop(token, None):
+            self.unrestricted.discard(client)
+            self.irc_clients.discard(client)
+        self.owner_by_token.pop(token, None)
+
+    def change_token(self, player: "Player", new_token: str) -> None:
+        """
+        Moves stored player to another token (used to fix tourney clients order)
+        """
+        self.store_by_token.pop(player.token, None)
+        self.store_by_client_token.pop(player.token, None)
+        player.token = new_token
+        self.store_by_token[new_token] = player
+        self.store_by_client_token[new_token] = player
+
     def get_token(
         self,
         uid: int = None,
@@ -37,16 +95,7 @@ class TokenStorage:
             return self.store_by_id.get(uid, None)
 
         if token:
-            if not self.store_by_token.get(token, None):
-                # we can't find token, but probably it's additional client?!
-                for (_, user) in self.store_by_token.items():
-                    if hasattr(user, "additional_clients"):
-                        if token in user.additional_clients:
-                            return user.additional_clients.get(token, None)
-
-                        continue
-
-            return self.store_by_token.get(token, None)
+            return self.store_by_client_token.get(token, None)
 
         if name:
             return self.store_by_name.get(name, None)
@@ -54,11 +103,8 @@ class TokenStorage:
         return None
 
     def delete_token(self, token: "Player") -> bool:
-        if token.is_tourneymode:
-            for (_, user) in self.store_by_token.items():
-                if hasattr(user, "additional_clients"):
-                    if token.token in user.additional_clients:
-                        user.additional_clients.pop(token.token)
+        if manager := self.owner_by_token.get(token.token, None):
+            manager.remove_additional_client(token.token)
 
         if (
             token.id not in self.store_by_id
@@ -67,28 +113,98 @@ class TokenStorage:
         ):
             return False
 
+        self.changed_presences.add(token)
+        # additional clients can't be found without manager
+        for sub_token in getattr(token, "additional_clients", {}):
+            self.delete_additional_token(sub_token)
+
+        self.store_by_client_token.pop(token.token, None)
+        self.in_lobby.discard(token)
+        self.unrestricted.discard(token)
+        self.irc_clients.discard(token)
         res = (
             self.store_by_token.pop(token.token, False)
             and self.store_by_id.pop(token.id, False)
             and self.store_by_name.pop(token.safe_name, False)
         )
         token.token = ""
+        self.online_changed = True
         return res
 
     def get_all_tokens(
         self,
         ignore_tournament_clients: bool = False,
     ) -> List[Union["Player", "IRCPlayer"]]:
-        normal_tokens = [
-            v for (k, v) in self.store_by_token.items()
-        ]  # just return all player instances
-        additional_tokens = []
-        if not ignore_tournament_clients:
-            for (_, user) in self.store_by_token.items():
-                if hasattr(user, "additional_clients"):
-                    additional_tokens.extend(
-                        [token for (_, token) in user.additional_clients.items()],
-                    )
-
-        normal_tokens.extend(additional_tokens)
-        return normal_tokens
+        """
+        Copy of stored tokens, use it when tokens can be added/deleted during iteration
+        """
+        if ignore_tournament_clients:
+            return list(self.store_by_token.values())
+
+        return list(self.store_by_client_token.values())
+
+    # Views below are live and aren't copied, so storage must not be changed while iterating them
+
+    def all_tokens(self) -> Iterable[Union["Player", "IRCPlayer"]]:
+        return self.store_by_client_token.values()
+
+    def primary_tokens(self) -> Iterable[Union["Player", "IRCPlayer"]]:
+        """
+        Tokens without additional tournament clients
+        """
+        return self.store_by_token.values()
+
+    def lobby_tokens(self) -> Iterable[Union["Player", "IRCPlayer"]]:
+        return iter(self.in_lobby)
+
+    def unrestricted_tokens(self) -> Iterable[Union["Player", "IRCPlayer"]]:
+        return iter(self.unrestricted)
+
+    def irc_tokens(self) -> Iterable["IRCPlayer"]:
+        return iter(self.irc_clients)
+
+    def get_online_count(self) -> int:
+        return len(self.store_by_token)
+
+    def lobby_changed(self, player: "Player") -> None:
+        if player.is_in_lobby and self.store_by_token.get(player.token, None) is player:
+            self.in_lobby.add(player)
+        else:
+            self.in_lobby.discard(player)
+
+    def privileges_changed(self, player: "Player") -> None:
+        if (
+            player.is_restricted
+            or self.store_by_client_token.get(player.token, None) is not player
+        ):
+            self.unrestricted.discard(player)
+        else:
+            self.unrestricted.add(player)
+
+    def presence_changed(self, player: "Player") -> None:
+        """
+        Player's presence/stats packets are outdated, snapshots will be updated on next read
+        """
+        self.changed_presences.add(player)
+
+    def refresh_snapshots(self) -> None:
+        for player in self.changed_presences:
+            if (
+                self.store_by_token.get(player.token, None) is player
+                and not player.is_restricted
+            ):
+                self.presences.put(player)
+                self.presences_with_stats.put(player)
+            else:
+                self.presences.remove(player)
+                self.presences_with_stats.remove(player)
+
+        self.changed_presences.clear()
+
+    def get_presences_snapshot(self) -> bytes:
+        self.refresh_snapshots()
+        return self.presences.get_blob()
+
+    def get_presences_with_stats_snapshot(self) -> bytes:
+        self.refresh_snapshots()
+        return self.presences_with_stats.get_blob()
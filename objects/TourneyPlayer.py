@@ -36,6 +36,8 @@ class TourneyPlayer(Player):
         is_tourneymode: bool = False,
         ip: str = "",
     ):
+        # defined before Player init, because it invalidates packets of additional clients
+        self.additional_clients: Dict[str, "Player"] = {}
         super().__init__(
             user_id,
             user_name,
@@ -48,11 +50,10 @@ class TourneyPlayer(Player):
             ip,
         )
 
-        self.additional_clients: Dict[str, "Player"] = {}
-
     def add_additional_client(self, client=None, token=None) -> Tuple[str, "Player"]:
         if client and token:
             self.additional_clients[token] = client
+            Context.players.add_additional_token(self, client)
             return token, client
 
         token = self.generate_token()
@@ -69,14 +70,27 @@ class TourneyPlayer(Player):
         )
         self.additional_clients[token].token = token
         self.additional_clients[token].stats = self.stats
+        Context.players.add_additional_token(self, self.additional_clients[token])
         return token, self.additional_clients[token]
 
     def remove_additional_client(self, token: str) -> bool:
         if token in self.additional_clients:
             self.additional_clients.pop(token)
+            Context.players.delete_additional_token(token)
 
         return True
 
+    def invalidate_packets(self) -> None:
+        super().invalidate_packets()
+        # additional clients share stats with manager
+        for client in self.additional_clients.values():
+            client.invalidate_packets()
+
+    @property
+    def can_share_packets(self) -> bool:
+        # irc subclients need messages in their format
+        return not any(hasattr(u, "irc") for u in self.additional_clients.values())
+
     @property
     def match(self) -> "Match":
         return None if self.id_tourney < 0 else Context.matches.get(self.id_tourney, None)
@@ -12,64 +12,119 @@ if TYPE_CHECKING:
     from objects.BanchoObjects import Message
 
 
-class KurisoPacketWriter:
-    def __init__(self):
-        self.buffer = b""
-
-    def get_string(self) -> bytes:
-        return self.buffer
-
-    def write_to_buffer(self, value: Union[bytes, bytearray]):
-        self.buffer = self.buffer + value
+U_INT_8 = struct.Struct("<B")
+INT_8 = struct.Struct("<b")
+U_INT_16 = struct.Struct("<H")
+INT_16 = struct.Struct("<h")
+U_INT_32 = struct.Struct("<I")
+INT_32 = struct.Struct("<i")
+U_INT_64 = struct.Struct("<Q")
+INT_64 = struct.Struct("<q")
+FLOAT = struct.Struct("<f")
+DOUBLE = struct.Struct("<d")
+
+# packet id (u16), empty byte and length of packet data (i32)
+PACKET_HEADER = struct.Struct("<Hxi")
+
+UNSIGNED_BY_LENGTH = {1: U_INT_8, 2: U_INT_16, 4: U_INT_32, 8: U_INT_64}
+SIGNED_BY_LENGTH = {1: INT_8, 2: INT_16, 4: INT_32, 8: INT_64}
+
+
+def struct_writer(packer: struct.Struct):
+    """
+    Makes writer method for fixed-width value, that packs it right into writer buffer
+    """
+    size = packer.size
+    pack_into = packer.pack_into
+
+    def writer(self: "KurisoPacketWriter", value: Union[int, float]) -> bool:
+        offset = self.position
+        self.position += size
+        if self.position > len(self.buffer):
+            self.grow()
+
+        pack_into(self.buffer, offset, value)
         return True
 
-    def write_u_int(self, value: int, byte_length: int) -> bool:
-        self.buffer = self.buffer + value.to_bytes(
-            byte_length,
-            byteorder="little",
-            signed=False,
-        )
-        return True
+    return writer
 
-    def write_int(self, value: int, byte_length: int) -> bool:
-        self.buffer = self.buffer + value.to_bytes(byte_length, byteorder="little", signed=True)
-        return True
 
-    def write_byte(self, value: int) -> bool:
-        return self.write_u_int(value, 1)
+class KurisoPacketWriter:
+    """
+    Packet writer backed by growable bytearray.
+    Fixed-width values are packed in place with `struct.pack_into`,
+    so building packet doesn't reallocate whole buffer on every written field.
+    """
 
-    def write_bytes(self, value: Union[Tuple, List]):
-        return self.write_to_buffer(bytearray(value))
+    __slots__ = ("buffer", "position")
 
-    def write_u_int_8(self, value: int) -> bool:
-        return self.write_u_int(value, 1)
+    def __init__(self, capacity: int = 64):
+        self.buffer = bytearray(capacity)
+        self.position = 0
 
-    def write_int_8(self, value: int) -> bool:
-        return self.write_int(value, 1)
+    def get_string(self) -> bytes:
+        # single copy of written part, bytearray slice would be copied twice
+        with memoryview(self.buffer) as view:
+            return view[: self.position].tobytes()
+
+    def grow(self) -> None:
+        # grow at least twice, so appending is amortized O(1)
+        self.buffer.extend(bytes(max(self.position, len(self.buffer) * 2) - len(self.buffer)))
+
+    def reserve(self, length: int) -> int:
+        """
+        Reserves `length` bytes in buffer and returns offset where they start
+        """
+        offset = self.position
+        self.position += length
+        if self.position > len(self.buffer):
+            self.grow()
+
+        return offset
+
+    def write_struct(self, packer: struct.Struct, *values: Any) -> bool:
+        packer.pack_into(self.buffer, self.reserve(packer.size), *values)
+        return True
 
-    def write_u_int_16(self, value: int) -> bool:
-        return self.write_u_int(value, 2)
+    def write_to_buffer(self, value: Union[bytes, bytearray, memoryview]):
+        offset = self.position
+        self.position += len(value)
+        if self.position > len(self.buffer):
+            self.grow()
 
-    def write_int_16(self, value: int) -> bool:
-        return self.write_int(value, 2)
+        self.buffer[offset : self.position] = value
+        return True
 
-    def write_u_int_32(self, value: int) -> bool:
-        return self.write_u_int(value, 4)
+    def write_u_int(self, value: int, byte_length: int) -> bool:
+        if packer := UNSIGNED_BY_LENGTH.get(byte_length, None):
+            return self.write_struct(packer, value)
 
-    def write_int_32(self, value: int) -> bool:
-        return self.write_int(value, 4)
+        return self.write_to_buffer(
+            value.to_bytes(byte_length, byteorder="little", signed=False),
+        )
 
-    def write_u_int_64(self, value: int) -> bool:
-        return self.write_to_buffer(struct.pack("<Q", value))
+    def write_int(self, value: int, byte_length: int) -> bool:
+        if packer := SIGNED_BY_LENGTH.get(byte_length, None):
+            return self.write_struct(packer, value)
 
-    def write_int_64(self, value: int) -> bool:
-        return self.write_to_buffer(struct.pack("<q", value))
+        return self.write_to_buffer(
+            value.to_bytes(byte_length, byteorder="little", signed=True)
+        )
 
-    def write_float(self, value: float) -> bool:
-        return self.write_to_buffer(struct.pack("<f", value))
+    def write_bytes(self, value: Union[Tuple, List]):
+        return self.write_to_buffer(bytearray(value))
 
-    def write_double(self, value: float) -> bool:
-        return self.write_to_buffer(struct.pack("<d", value))
+    write_byte = struct_writer(U_INT_8)
+    write_u_int_8 = struct_writer(U_INT_8)
+    write_int_8 = struct_writer(INT_8)
+    write_u_int_16 = struct_writer(U_INT_16)
+    write_int_16 = struct_writer(INT_16)
+    write_u_int_32 = struct_writer(U_INT_32)
+    write_int_32 = struct_writer(INT_32)
+    write_u_int_64 = struct_writer(U_INT_64)
+    write_int_64 = struct_writer(INT_64)
+    write_float = struct_writer(FLOAT)
+    write_double = struct_writer(DOUBLE)
 
     def write_string(self, value: str) -> bool:
         return self.write_to_buffer(value.encode(errors="ignore"))
@@ -78,46 +133,45 @@ class KurisoPacketWriter:
         return self.write_byte(1 if value else 0)
 
     def write_variant(self, value: int) -> bool:
-        arr = []
-        length = 0
+        if value < 0x80:
+            # most of strings are shorter than 128 bytes
+            return self.write_byte(value) if value > 0 else True
+
+        arr = bytearray()
         while value > 0:
-            arr.append(value & 0x7F)
+            byte = value & 0x7F
             value >>= 7
             if value != 0:
-                arr[length] |= 0x80
-            length += 1
+                byte |= 0x80
+            arr.append(byte)
 
-        return self.write_to_buffer(bytearray(arr))
+        return self.write_to_buffer(arr)
 
     def write_osu_string(self, value: str) -> bool:
         if len(value) == 0:
-            self.write_byte(11)
-            self.write_byte(0)
-        else:
-            self.write_byte(11)
-            self.write_variant(len(value.encode(errors="ignore")))
-            self.write_string(value)
+            return self.write_to_buffer(b"\x0b\x00")
 
-        return True
+        encoded = value.encode(errors="ignore")
+        self.write_byte(11)
+        self.write_variant(len(encoded))
+        return self.write_to_buffer(encoded)
 
     def write_u_leb_128(self, value: int) -> bool:
         return self.write_variant(value)
 
     def write_i32_list(self, list_integers: Tuple[int, ...]) -> bool:
         self.write_u_int_16(len(list_integers))
-        for integer in list_integers:
-            self.write_u_int_32(integer)
+        return self.write_to_buffer(struct.pack(f"<{len(list_integers)}I", *list_integers))
 
-        return True
+    def write_i32_list4l(self, list_integers: Tuple[int, ...]) -> bool:
+        self.write_u_int_32(len(list_integers))
+        return self.write_to_buffer(struct.pack(f"<{len(list_integers)}I", *list_integers))
 
     def write_mp_match(self, arguments: List[Union["Match", bool]]) -> bool:
         match: "Match" = arguments[0]
         send_pw: bool = arguments[1]
 
-        self.write_int_16(match.id)
-        self.write_bool(match.in_progress)
-        self.write_byte(match.match_type.value)
-        self.write_int_32(match.mods.value)
+        self.write_struct(MATCH_HEAD, match.id, match.in_progress, match.match_type, match.mods)
         self.write_osu_string(match.name)
         if match.password:
             if send_pw:
@@ -130,34 +184,33 @@ class KurisoPacketWriter:
         self.write_int_32(match.beatmap_id)
         self.write_osu_string(match.beatmap_md5)
 
-        for slot in match.slots:  # add slot status
-            self.write_byte(slot.status.value)
-
-        for slot in match.slots:  # add slot team color
-            self.write_byte(slot.team.value)
+        # slot statuses, then slot team colors
+        self.write_struct(
+            MATCH_SLOTS,
+            *[slot.status for slot in match.slots],
+            *[slot.team for slot in match.slots],
+        )
 
-        for slot in match.slots:
-            if (
-                slot.status.value & SlotStatus.HasPlayer
-            ):  # if player exists in that slot, add it
-                self.write_int_32(slot.token.id)
+        # if player exists in that slot, add it
+        players = [slot.token.id for slot in match.slots if slot.status & SlotStatus.HasPlayer]
+        self.write_to_buffer(struct.pack(f"<{len(players)}i", *players))
 
         if match.is_tourney:
-            if match.host_tourney:
-                self.write_int_32(match.host_tourney.id)
-            else:
-                self.write_int_32(-1)
+            host_id = match.host_tourney.id if match.host_tourney else -1
         else:
-            self.write_int_32(match.host.id)
+            host_id = match.host.id
 
-        self.write_byte(match.match_playmode.value)
-        self.write_byte(match.match_scoring_type.value)
-        self.write_byte(match.match_team_type.value)
-        self.write_byte(match.match_freemod.value)
+        self.write_struct(
+            MATCH_SETTINGS,
+            host_id,
+            match.match_playmode,
+            match.match_scoring_type,
+            match.match_team_type,
+            match.match_freemod,
+        )
 
         if match.is_freemod:
-            for slot in match.slots:
-                self.write_int_32(slot.mods.value)
+            self.write_struct(MATCH_FREEMODS, *[slot.mods for slot in match.slots])
 
         self.write_int_32(match.seed)
         return True
@@ -170,39 +223,315 @@ class KurisoPacketWriter:
     ) -> bytes:
         # writing packet
         writer = KurisoPacketWriter()
-        packet_header = struct.pack("<Hx", pid.value if isinstance(pid, OsuPacketID) else pid)
-
-        ptypes = {
-            osuTypes.i32_list: writer.write_i32_list,
-            osuTypes.string: writer.write_osu_string,
-            osuTypes.raw: writer.write_to_buffer,
-            osuTypes.match: writer.write_mp_match,
-            # TODO: add another custom bancho types
-            osuTypes.byte: writer.write_byte,
-            osuTypes.bool: writer.write_bool,
-            osuTypes.int8: writer.write_int_8,
-            osuTypes.u_int8: writer.write_u_int_8,
-            osuTypes.int16: writer.write_int_16,
-            osuTypes.u_int16: writer.write_u_int_16,
-            osuTypes.int32: writer.write_int_32,
-            osuTypes.u_int32: writer.write_u_int_32,
-            # doesn't care
-            osuTypes.float32: writer.write_float,
-            osuTypes.float64: writer.write_float,
-            osuTypes.int64: writer.write_int_64,
-            osuTypes.u_int64: writer.write_u_int_64,
-        }
 
+        writer.reserve(PACKET_HEADER.size)  # header will be written after packet data
         for packet, packet_type in args:
-            if not (p_writer := ptypes.get(packet_type, None)):
+            if not (p_writer := PACKET_WRITERS.get(packet_type, None)):
                 continue  # can't identify packet type
 
-            p_writer(packet)
-
-        packets = writer.get_string()
-        return (
-            packet_header + len(packets).to_bytes(4, signed=True, byteorder="little") + packets
-        )
+            p_writer(writer, packet)
+
+        PACKET_HEADER.pack_into(
+            writer.buffer,
+            0,
+            pid.value if isinstance(pid, OsuPacketID) else pid,
+            writer.position - PACKET_HEADER.size,
+        )
+        return writer.get_string()
+
+
+MATCH_HEAD = struct.Struct("<h?Bi")  # id, in progress, match type, mods
+MATCH_SLOTS = struct.Struct("<32B")  # 16 slot statuses and 16 slot teams
+MATCH_SETTINGS = struct.Struct("<i4B")  # host, play mode, scoring, team type, freemod
+MATCH_FREEMODS = struct.Struct("<16i")
+
+PACKET_WRITERS = {
+    osuTypes.i32_list: KurisoPacketWriter.write_i32_list,
+    osuTypes.string: KurisoPacketWriter.write_osu_string,
+    osuTypes.raw: KurisoPacketWriter.write_to_buffer,
+    osuTypes.i32_list4l: KurisoPacketWriter.write_i32_list4l,
+    osuTypes.match: KurisoPacketWriter.write_mp_match,
+    osuTypes.byte: KurisoPacketWriter.write_byte,
+    osuTypes.bool: KurisoPacketWriter.write_bool,
+    osuTypes.int8: KurisoPacketWriter.write_int_8,
+    osuTypes.u_int8: KurisoPacketWriter.write_u_int_8,
+    osuTypes.int16: KurisoPacketWriter.write_int_16,
+    osuTypes.u_int16: KurisoPacketWriter.write_u_int_16,
+    osuTypes.int32: KurisoPacketWriter.write_int_32,
+    osuTypes.u_int32: KurisoPacketWriter.write_u_int_32,
+    # doesn't care
+    osuTypes.float32: KurisoPacketWriter.write_float,
+    osuTypes.float64: KurisoPacketWriter.write_float,
+    osuTypes.int64: KurisoPacketWriter.write_int_64,
+    osuTypes.u_int64: KurisoPacketWriter.write_u_int_64,
+}
+
+# struct formats of fixed-width osuTypes, float64 is sent as float32 as well (see PACKET_WRITERS)
+FIXED_FORMATS = {
+    osuTypes.int8: "b",
+    osuTypes.u_int8: "B",
+    osuTypes.int16: "h",
+    osuTypes.u_int16: "H",
+    osuTypes.int32: "i",
+    osuTypes.u_int32: "I",
+    osuTypes.float32: "f",
+    osuTypes.float64: "f",
+    osuTypes.int64: "q",
+    osuTypes.u_int64: "Q",
+    osuTypes.bool: "?",
+    osuTypes.byte: "B",
+}
+
+
+def encode_uleb128(value: int) -> bytes:
+    if value < 0x80:
+        return bytes((value,)) if value > 0 else b""
+
+    arr = bytearray()
+    while value > 0:
+        byte = value & 0x7F
+        value >>= 7
+        if value != 0:
+            byte |= 0x80
+        arr.append(byte)
+
+    return bytes(arr)
+
+
+def encode_osu_string(value: str) -> bytes:
+    if len(value) == 0:
+        return b"\x0b\x00"
+
+    encoded = value.encode(errors="ignore")
+    return b"\x0b" + encode_uleb128(len(encoded)) + encoded
+
+
+def encode_i32_list(list_integers: Tuple[int, ...]) -> bytes:
+    return struct.pack(f"<H{len(list_integers)}I", len(list_integers), *list_integers)
+
+
+def encode_i32_list4l(list_integers: Tuple[int, ...]) -> bytes:
+    return struct.pack(f"<I{len(list_integers)}I", len(list_integers), *list_integers)
+
+
+def encode_raw(
+    data: Union[bytes, bytearray, memoryview]
+) -> Union[bytes, bytearray, memoryview]:
+    # bytes-like data is passed as is, it's copied once by join of packet parts
+    return data
+
+
+def encode_match(arguments: List[Union["Match", bool]]) -> bytes:
+    writer = KurisoPacketWriter(256)
+    writer.write_mp_match(arguments)
+    return writer.get_string()
+
+
+# encoders for field types which can't be described by struct format
+VARIABLE_ENCODERS = {
+    osuTypes.string: encode_osu_string,
+    osuTypes.raw: encode_raw,
+    osuTypes.i32_list: encode_i32_list,
+    osuTypes.i32_list4l: encode_i32_list4l,
+    osuTypes.match: encode_match,
+}
+
+
+class PacketSchema:
+    """
+    Packet layout described once as sequence of osuTypes.
+    It's compiled at import into specialised encoder: packets with only fixed-width fields
+    are packed (with header) by single struct.Struct, other packets are split into parts
+    where every run of fixed-width fields is one struct.Struct and strings/raw data are encoded inline.
+    """
+
+    __slots__ = ("packet_id", "encode")
+
+    def __init__(self, pid: OsuPacketID, *field_types: osuTypes):
+        self.packet_id = pid.value
+        self.encode = self.compile(self.packet_id, field_types)
+
+    def __call__(self, *values: Any) -> bytes:
+        return self.encode(*values)
+
+    @staticmethod
+    def compile(packet_id: int, field_types: Tuple[osuTypes, ...]):
+        if not field_types:
+            packet = PACKET_HEADER.pack(packet_id, 0)
+            return lambda: packet
+
+        if all(field_type in FIXED_FORMATS for field_type in field_types):
+            packer = struct.Struct(
+                PACKET_HEADER.format + "".join(FIXED_FORMATS[t] for t in field_types),
+            )
+            pack, data_size = packer.pack, packer.size - PACKET_HEADER.size
+            return lambda *values: pack(packet_id, data_size, *values)
+
+        # split fields into parts: (encoder, first value index, last value index)
+        parts = []
+        fixed_run = ""
+        fixed_start = 0
+        for ind, field_type in enumerate(field_types):
+            if field_type in FIXED_FORMATS:
+                if not fixed_run:
+                    fixed_start = ind
+                fixed_run += FIXED_FORMATS[field_type]
+                continue
+
+            if fixed_run:
+                parts.append((struct.Struct("<" + fixed_run).pack, fixed_start, ind))
+                fixed_run = ""
+
+            parts.append((VARIABLE_ENCODERS[field_type], ind, None))
+
+        if fixed_run:
+            parts.append((struct.Struct("<" + fixed_run).pack, fixed_start, len(field_types)))
+
+        pack_header = PACKET_HEADER.pack
+
+        def encode(*values: Any) -> bytes:
+            chunks = [
+                encoder(values[start]) if end is None else encoder(*values[start:end])
+                for (encoder, start, end) in parts
+            ]
+            # header and parts are joined at once, so every part is copied once
+            chunks.insert(0, pack_header(packet_id, sum(map(len, chunks))))
+            return b"".join(chunks)
+
+        return encode
+
+
+# server packet: 5
+LOGIN_REPLY = PacketSchema(OsuPacketID.Bancho_LoginReply, osuTypes.int32)
+TITLE_UPDATE = PacketSchema(OsuPacketID.Bancho_TitleUpdate, osuTypes.string)
+# server packet: 24
+ANNOUNCE = PacketSchema(OsuPacketID.Bancho_Announce, osuTypes.string)
+# server packet: 75
+PROTOCOL_NEGOTIATION = PacketSchema(OsuPacketID.Bancho_ProtocolNegotiation, osuTypes.int32)
+# server packet: 71
+LOGIN_PERMISSIONS = PacketSchema(OsuPacketID.Bancho_LoginPermissions, osuTypes.int32)
+# server packet: 72
+FRIENDS_LIST = PacketSchema(OsuPacketID.Bancho_FriendsList, osuTypes.i32_list)
+# server packet: 92
+BAN_INFO = PacketSchema(OsuPacketID.Bancho_BanInfo, osuTypes.u_int32)
+# server packet: 83
+USER_PRESENCE = PacketSchema(
+    OsuPacketID.Bancho_UserPresence,
+    osuTypes.int32,  # id
+    osuTypes.string,  # name
+    osuTypes.u_int8,  # timezone
+    osuTypes.u_int8,  # country
+    osuTypes.u_int8,  # bancho privileges
+    osuTypes.float64,  # longitude
+    osuTypes.float64,  # latitude
+    osuTypes.int32,  # leaderboard rank
+)
+# server packet: 11
+USER_STATS = PacketSchema(
+    OsuPacketID.Bancho_HandleOsuUpdate,
+    osuTypes.int32,  # id
+    osuTypes.u_int8,  # action
+    osuTypes.string,  # action text
+    osuTypes.string,  # map md5
+    osuTypes.int32,  # mods
+    osuTypes.u_int8,  # mode
+    osuTypes.int32,  # map id
+    osuTypes.int64,  # ranked score
+    osuTypes.float32,  # accuracy
+    osuTypes.int32,  # total plays
+    osuTypes.u_int64,  # total score
+    osuTypes.int32,  # leaderboard rank
+    osuTypes.int16,  # pp
+)
+# server packet: 12
+USER_QUIT = PacketSchema(OsuPacketID.Bancho_HandleUserQuit, osuTypes.int32, osuTypes.u_int8)
+# server packet: 64
+CHANNEL_JOIN_SUCCESS = PacketSchema(OsuPacketID.Bancho_ChannelJoinSuccess, osuTypes.string)
+# server packet: 66
+CHANNEL_REVOKED = PacketSchema(OsuPacketID.Bancho_ChannelRevoked, osuTypes.string)
+# server packet: 7
+SEND_MESSAGE = PacketSchema(
+    OsuPacketID.Bancho_SendMessage,
+    osuTypes.string,  # sender
+    osuTypes.string,  # body
+    osuTypes.string,  # target
+    osuTypes.int32,  # sender id
+)
+# server packet: 65
+CHANNEL_AVAILABLE = PacketSchema(
+    OsuPacketID.Bancho_ChannelAvailable,
+    osuTypes.string,  # name
+    osuTypes.string,  # description
+    osuTypes.int16,  # users count
+)
+# server packet: 89
+CHANNEL_LISTING_COMPLETE = PacketSchema(OsuPacketID.Bancho_ChannelListingComplete)
+# server packet: 100
+USER_PM_BLOCKED = PacketSchema(
+    OsuPacketID.Bancho_UserPMBlocked,
+    osuTypes.string,
+    osuTypes.string,
+    osuTypes.string,
+    osuTypes.int32,
+)
+# server packet: 101
+TARGET_IS_SILENCED = PacketSchema(
+    OsuPacketID.Bancho_TargetIsSilenced,
+    osuTypes.string,
+    osuTypes.string,
+    osuTypes.string,
+    osuTypes.int32,
+)
+# server packet: 42
+FELLOW_SPECTATOR_JOINED = PacketSchema(OsuPacketID.Bancho_FellowSpectatorJoined, osuTypes.int32)
+# server packet: 13
+SPECTATOR_JOINED = PacketSchema(OsuPacketID.Bancho_SpectatorJoined, osuTypes.int32)
+# server packet: 43
+FELLOW_SPECTATOR_LEFT = PacketSchema(OsuPacketID.Bancho_FellowSpectatorLeft, osuTypes.int32)
+# server packet: 14
+SPECTATOR_LEFT = PacketSchema(OsuPacketID.Bancho_SpectatorLeft, osuTypes.int32)
+# server packet: 22
+SPECTATOR_CANT_SPECTATE = PacketSchema(OsuPacketID.Bancho_SpectatorCantSpectate, osuTypes.int32)
+# server packet: 15
+SPECTATE_FRAMES = PacketSchema(OsuPacketID.Bancho_SpectateFrames, osuTypes.raw)
+# server packet: 26
+MATCH_UPDATE = PacketSchema(OsuPacketID.Bancho_MatchUpdate, osuTypes.match)
+# server packet: 27
+MATCH_NEW = PacketSchema(OsuPacketID.Bancho_MatchNew, osuTypes.match)
+# server packet: 36
+MATCH_JOIN_SUCCESS = PacketSchema(OsuPacketID.Bancho_MatchJoinSuccess, osuTypes.match)
+# server packet: 37
+MATCH_JOIN_FAIL = PacketSchema(OsuPacketID.Bancho_MatchJoinFail)
+# server packet: 46
+MATCH_START = PacketSchema(OsuPacketID.Bancho_MatchStart, osuTypes.match)
+# server packet: 28
+MATCH_DISBAND = PacketSchema(OsuPacketID.Bancho_MatchDisband, osuTypes.int32)
+# server packet: 50
+MATCH_TRANSFER_HOST = PacketSchema(OsuPacketID.Bancho_MatchTransferHost)
+# server packet: 61
+MATCH_SKIP = PacketSchema(OsuPacketID.Bancho_MatchSkip)
+# server packet: 53
+MATCH_ALL_PLAYERS_LOADED = PacketSchema(OsuPacketID.Bancho_MatchAllPlayersLoaded)
+# server packet: 48
+MATCH_SCORE_UPDATE = PacketSchema(OsuPacketID.Bancho_MatchScoreUpdate, osuTypes.raw)
+# server packet: 58
+MATCH_COMPLETE = PacketSchema(OsuPacketID.Bancho_MatchComplete)
+# server packet: 57
+MATCH_PLAYER_FAILED = PacketSchema(OsuPacketID.Bancho_MatchPlayerFailed, osuTypes.int16)
+# server packet: 86
+RESTART = PacketSchema(OsuPacketID.Bancho_Restart, osuTypes.u_int32)
+# server packet: 94
+USER_SILENCED = PacketSchema(OsuPacketID.Bancho_UserSilenced, osuTypes.u_int32)
+# server packet: 104
+ACCOUNT_RESTRICTED = PacketSchema(OsuPacketID.Bancho_AccountRestricted)
+# server packet: 107
+SWITCH_TOURNEY_SERVER = PacketSchema(OsuPacketID.Bancho_SwitchTourneyServer, osuTypes.string)
+# server packet: 105
+RTX_MESSAGE = PacketSchema(OsuPacketID.Bancho_RTX, osuTypes.string)
+# server packet: 8
+PING = PacketSchema(OsuPacketID.Bancho_Ping, osuTypes.byte)
+# server packet: 106
+MATCH_ABORT = PacketSchema(OsuPacketID.Client_MatchAbort)
 
 
 class PacketBuilder:
@@ -220,71 +549,49 @@ class PacketBuilder:
         # -7: password reset
         # -8: requires verification
         # ??: valid id
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_LoginReply.value,
-            (user_id, osuTypes.int32),
-        )
+        return LOGIN_REPLY(user_id)
 
     @staticmethod
     def MainMenuIcon(icon: str) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_TitleUpdate.value,
-            (icon, osuTypes.string),
-        )
+        return TITLE_UPDATE(icon)
 
     # server packet: 25
     @staticmethod
     def Notification(message: str) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_Announce,
-            (message, osuTypes.string),
-        )
+        return ANNOUNCE(message)
 
     # server packet: 75
     @staticmethod
     def ProtocolVersion(version: int) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_ProtocolNegotiation.value,
-            (version, osuTypes.int32),
-        )
+        return PROTOCOL_NEGOTIATION(version)
 
     # server packet: 71
     @staticmethod
     def BanchoPrivileges(privs: int) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_LoginPermissions.value,
-            (privs, osuTypes.int32),
-        )
+        return LOGIN_PERMISSIONS(privs)
 
     # server packet: 72
     @staticmethod
     def FriendList(friend_list: Union[List[int]]) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_FriendsList.value,
-            (friend_list, osuTypes.i32_list),
-        )
+        return FRIENDS_LIST(friend_list)
 
     # server packet: 92
     @staticmethod
     def SilenceEnd(silence_time: int) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_BanInfo.value,
-            (silence_time, osuTypes.u_int32),
-        )
+        return BAN_INFO(silence_time)
 
     # server packet: 83
     @staticmethod
     def UserPresence(player: "Player") -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_UserPresence.value,
-            (player.id, osuTypes.int32),
-            (player.name, osuTypes.string),
-            (player.timezone, osuTypes.u_int8),
-            (player.country[0], osuTypes.u_int8),
-            (player.bancho_privs.value, osuTypes.u_int8),
-            (player.location[1], osuTypes.float64),
-            (player.location[0], osuTypes.float64),
-            (player.current_stats.leaderboard_rank, osuTypes.int32),
+        return USER_PRESENCE(
+            player.id,
+            player.name,
+            player.timezone,
+            player.country[0],
+            player.bancho_privs.value,
+            player.location[1],
+            player.location[0],
+            player.current_stats.leaderboard_rank,
         )
 
     # client packet: 3, bancho response: 11
@@ -293,282 +600,189 @@ class PacketBuilder:
         if player.is_tourneymode:
             return b""  # return empty data to hide stats
 
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_HandleOsuUpdate.value,
-            (player.id, osuTypes.int32),
-            (player.pr_status.action.value, osuTypes.u_int8),
-            (player.pr_status.action_text, osuTypes.string),
-            (player.pr_status.map_md5, osuTypes.string),
-            (player.pr_status.mods.value, osuTypes.int32),
-            (player.pr_status.mode.value, osuTypes.u_int8),
-            (player.pr_status.map_id, osuTypes.int32),
-            (player.current_stats.ranked_score, osuTypes.int64),
-            (player.current_stats.accuracy / 100.0, osuTypes.float32),
-            (player.current_stats.total_plays, osuTypes.int32),
-            (player.current_stats.total_score, osuTypes.u_int64),
-            (player.current_stats.leaderboard_rank, osuTypes.int32),
-            (player.current_stats.pp, osuTypes.int16),
+        status = player.pr_status
+        stats = player.current_stats
+        return USER_STATS(
+            player.id,
+            status.action.value,
+            status.action_text,
+            status.map_md5,
+            status.mods.value,
+            status.mode.value,
+            status.map_id,
+            stats.ranked_score,
+            stats.accuracy / 100.0,
+            stats.total_plays,
+            stats.total_score,
+            stats.leaderboard_rank,
+            stats.pp,
         )
 
     # client packet: 2, bancho response: 12
     @staticmethod
     def Logout(uid: int) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_HandleUserQuit.value,
-            (uid, osuTypes.int32),
-            (0, osuTypes.u_int8),
-        )
+        return USER_QUIT(uid, 0)
 
     # bancho response: 64
     @staticmethod
     def SuccessJoinChannel(name: str) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_ChannelJoinSuccess.value,
-            (name, osuTypes.string),
-        )
+        return CHANNEL_JOIN_SUCCESS(name)
 
     @staticmethod
     def ErrorJoinChannel(name: str) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_ChannelJoinSuccess.value,
-            (name, osuTypes.string),
-        )
+        return CHANNEL_JOIN_SUCCESS(name)
 
     # bancho response: 66
     @staticmethod
     def PartChannel(name: str) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_ChannelRevoked.value,
-            (name, osuTypes.string),
-        )
+        return CHANNEL_REVOKED(name)
 
     # bancho response: 7
     @staticmethod
     def BuildMessage(uid: int, message: "Message") -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_SendMessage.value,
-            (message.sender, osuTypes.string),
-            (message.body, osuTypes.string),
-            (message.to, osuTypes.string),
-            (uid, osuTypes.int32),
-        )
+        return SEND_MESSAGE(message.sender, message.body, message.to, uid)
 
     # bancho response: 65
     @staticmethod
     def ChannelAvailable(channel) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_ChannelAvailable.value,
-            (channel.name, osuTypes.string),
-            (channel.description, osuTypes.string),
-            (len(channel.users), osuTypes.int16),
-        )
+        return CHANNEL_AVAILABLE(channel.name, channel.description, len(channel.users))
 
     # bancho response: 89
     @staticmethod
     def ChannelListeningEnd() -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_ChannelListingComplete.value,
-        )
+        return CHANNEL_LISTING_COMPLETE()
 
     # bancho response: 100
     @staticmethod
     def PMBlocked(target: str) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_UserPMBlocked.value,
-            ("", osuTypes.string),
-            ("", osuTypes.string),
-            (target, osuTypes.string),
-            (0, osuTypes.int32),
-        )
+        return USER_PM_BLOCKED("", "", target, 0)
 
     # bancho response: 101
     @staticmethod
     def TargetSilenced(target: str) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_TargetIsSilenced.value,
-            ("", osuTypes.string),
-            ("", osuTypes.string),
-            (target, osuTypes.string),
-            (0, osuTypes.int32),
-        )
+        return TARGET_IS_SILENCED("", "", target, 0)
 
     # bancho response: 42
     @staticmethod
     def FellowSpectatorJoined(uid: int) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_FellowSpectatorJoined.value,
-            (uid, osuTypes.int32),
-        )
+        return FELLOW_SPECTATOR_JOINED(uid)
 
     # bancho response: 13
     @staticmethod
     def SpectatorJoined(uid: int) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_SpectatorJoined.value,
-            (uid, osuTypes.int32),
-        )
+        return SPECTATOR_JOINED(uid)
 
     # bancho response: 43
     @staticmethod
     def FellowSpectatorLeft(uid: int) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_FellowSpectatorLeft.value,
-            (uid, osuTypes.int32),
-        )
+        return FELLOW_SPECTATOR_LEFT(uid)
 
     # bancho response: 14
     @staticmethod
     def SpectatorLeft(uid: int) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_SpectatorLeft.value,
-            (uid, osuTypes.int32),
-        )
+        return SPECTATOR_LEFT(uid)
 
     # bancho response: 22
     @staticmethod
     def CantSpectate(uid: int) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_SpectatorCantSpectate.value,
-            (uid, osuTypes.int32),
-        )
+        return SPECTATOR_CANT_SPECTATE(uid)
 
     # bancho response: 15
     @staticmethod
     def QuickSpectatorFrame(data: bytes) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_SpectateFrames.value,
-            (data, osuTypes.raw),
-        )
+        return SPECTATE_FRAMES(data)
 
     # bancho response: 26
     @staticmethod
     def UpdateMatch(match: "Match", send_pw: bool = True) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_MatchUpdate.value,
-            ((match, send_pw), osuTypes.match),
-        )
+        return MATCH_UPDATE((match, send_pw))
 
     # bancho response: 27
     @staticmethod
     def NewMatch(match: "Match") -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_MatchNew.value,
-            ((match, False), osuTypes.match),
-        )
+        return MATCH_NEW((match, False))
 
     # bancho response: 36
     @staticmethod
     def MatchJoinSuccess(match: "Match") -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_MatchJoinSuccess.value,
-            ((match, True), osuTypes.match),
-        )
+        return MATCH_JOIN_SUCCESS((match, True))
 
     # bancho response: 37
     @staticmethod
     def MatchJoinFailed() -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(OsuPacketID.Bancho_MatchJoinFail.value)
+        return MATCH_JOIN_FAIL()
 
     # bancho response: 46
     @staticmethod
     def InitiateStartMatch(match: "Match") -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_MatchStart.value,
-            ((match, True), osuTypes.match),
-        )
+        return MATCH_START((match, True))
 
     # bancho response: 28
     @staticmethod
     def DisbandMatch(match: "Match") -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_MatchDisband.value,
-            (match.id, osuTypes.int32),
-        )
+        return MATCH_DISBAND(match.id)
 
     # bancho response: 50
     @staticmethod
     def MatchHostTransfer() -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(OsuPacketID.Bancho_MatchTransferHost.value)
+        return MATCH_TRANSFER_HOST()
 
     # bancho response: 61
     @staticmethod
     def MultiSkip():
-        return KurisoPacketWriter.CreateBanchoPacket(OsuPacketID.Bancho_MatchSkip.value)
+        return MATCH_SKIP()
 
     # bancho response: 53
     @staticmethod
     def AllPlayersLoaded():
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_MatchAllPlayersLoaded.value,
-        )
+        return MATCH_ALL_PLAYERS_LOADED()
 
     # bancho response: 48
     @staticmethod
     def MultiScoreUpdate(packet_data: bytearray) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_MatchScoreUpdate.value,
-            (packet_data, osuTypes.raw),
-        )
+        return MATCH_SCORE_UPDATE(packet_data)
 
     # bancho response: 58
     @staticmethod
     def MatchFinished() -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(OsuPacketID.Bancho_MatchComplete.value)
+        return MATCH_COMPLETE()
 
     # bancho response: 57
     @staticmethod
     def MatchPlayerFailed(slot_ind: int) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_MatchPlayerFailed.value,
-            (slot_ind, osuTypes.int16),
-        )
+        return MATCH_PLAYER_FAILED(slot_ind)
 
     # bancho response: 86
     @staticmethod
     def BanchoRestarting(ms: int) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_Restart,
-            (ms, osuTypes.u_int32),
-        )
+        return RESTART(ms)
 
     # bancho response: 94
     @staticmethod
     def UserSilenced(user_id: int) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_UserSilenced.value,
-            (user_id, osuTypes.u_int32),
-        )
+        return USER_SILENCED(user_id)
 
     # bancho response: 104
     @staticmethod
     def UserRestricted() -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(OsuPacketID.Bancho_AccountRestricted.value)
+        return ACCOUNT_RESTRICTED()
 
     # bancho response: 107
     @staticmethod
     def SwitchServer(new_server: str) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_SwitchTourneyServer.value,
-            (new_server, osuTypes.string),
-        )
+        return SWITCH_TOURNEY_SERVER(new_server)
 
     # bancho response: 105
     @staticmethod
     def RTX(message: str) -> bytes:
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_RTX.value,
-            (message, osuTypes.string),
-        )
+        return RTX_MESSAGE(message)
 
     # bancho response: 0 but with bad byte
     @staticmethod
     def KillPing():
-        return KurisoPacketWriter.CreateBanchoPacket(
-            OsuPacketID.Bancho_Ping.value,
-            (0, osuTypes.byte),
-        )
+        return PING(0)
 
     # bancho response: 106
     @staticmethod
     def MatchAborted():
-        return KurisoPacketWriter.CreateBanchoPacket(OsuPacketID.Client_MatchAbort.value)
+        return MATCH_ABORT()
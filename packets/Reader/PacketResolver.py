@@ -1,3 +1,4 @@
+import struct
 from typing import List, Tuple
 
 from objects.TypedDicts import TypedPresence, TypedReadMatch
@@ -15,149 +16,138 @@ from objects.Multiplayer import Slot
 from objects.BanchoObjects import Message
 from packets.Reader.index import KurisoPacketReader
 
+MATCH_SLOTS = struct.Struct("<32B")  # 16 slot statuses and 16 slot teams
+MATCH_SETTINGS = struct.Struct("<i3B?")  # host, play mode, scoring, team type, freemod
+MATCH_FREEMODS = struct.Struct("<16i")
+
 
 class PacketResolver:
     @staticmethod
-    def read_new_presence(data: bytes) -> TypedPresence:
-        with memoryview(data) as buffer:
-            reader = KurisoPacketReader(buffer)
-            return {
-                "action": reader.read_byte(),
-                "action_text": reader.read_osu_string(),
-                "map_md5": reader.read_osu_string(),
-                "mods": reader.read_u_int_32(),
-                "mode": reader.read_byte(),
-                "map_id": reader.read_int_32(),
-            }
+    def read_new_presence(data: memoryview) -> TypedPresence:
+        reader = KurisoPacketReader(data)
+        return {
+            "action": reader.read_byte(),
+            "action_text": reader.read_osu_string(),
+            "map_md5": reader.read_osu_string(),
+            "mods": reader.read_u_int_32(),
+            "mode": reader.read_byte(),
+            "map_id": reader.read_int_32(),
+        }
 
     @staticmethod
-    def read_request_users_stats(data: bytes) -> List[int]:
-        with memoryview(data) as buffer:
-            reader = KurisoPacketReader(buffer)
-            return reader.read_i32_list()
+    def read_request_users_stats(data: memoryview) -> List[int]:
+        reader = KurisoPacketReader(data)
+        return reader.read_i32_list()
 
     @staticmethod
-    def read_pr_filter(data: bytes) -> int:
-        with memoryview(data) as buffer:
-            reader = KurisoPacketReader(buffer)
-            return reader.read_int_32()
+    def read_pr_filter(data: memoryview) -> int:
+        reader = KurisoPacketReader(data)
+        return reader.read_int_32()
 
     @staticmethod
-    def read_slot_index(data: bytes) -> int:
-        with memoryview(data) as buffer:
-            reader = KurisoPacketReader(buffer)
-            return reader.read_int_32()
+    def read_slot_index(data: memoryview) -> int:
+        reader = KurisoPacketReader(data)
+        return reader.read_int_32()
 
     @staticmethod
-    def read_message(data: bytes) -> Message:
-        with memoryview(data) as buffer:
-            reader = KurisoPacketReader(buffer)
-            return Message(
-                sender=reader.read_osu_string(),
-                body=reader.read_osu_string(),
-                to=reader.read_osu_string(),
-                client_id=reader.read_int_32(),
-            )
+    def read_message(data: memoryview) -> Message:
+        reader = KurisoPacketReader(data)
+        return Message(
+            sender=reader.read_osu_string(),
+            body=reader.read_osu_string(),
+            to=reader.read_osu_string(),
+            client_id=reader.read_int_32(),
+        )
 
     @staticmethod
-    def read_channel_name(data: bytes) -> str:
-        with memoryview(data) as buffer:
-            reader = KurisoPacketReader(buffer)
-            return reader.read_osu_string()
+    def read_channel_name(data: memoryview) -> str:
+        reader = KurisoPacketReader(data)
+        return reader.read_osu_string()
 
     @staticmethod
-    def read_specatator_id(data: bytes) -> int:
-        with memoryview(data) as buffer:
-            reader = KurisoPacketReader(buffer)
-            return reader.read_int_32()
+    def read_specatator_id(data: memoryview) -> int:
+        reader = KurisoPacketReader(data)
+        return reader.read_int_32()
 
     @staticmethod
-    def read_friend_id(data: bytes) -> int:
-        with memoryview(data) as buffer:
-            reader = KurisoPacketReader(buffer)
-            return reader.read_int_32()
+    def read_friend_id(data: memoryview) -> int:
+        reader = KurisoPacketReader(data)
+        return reader.read_int_32()
 
     @staticmethod
-    def read_match(data: bytes) -> TypedReadMatch:
-        with memoryview(data) as buffer:
-            reader = KurisoPacketReader(buffer)
-
-            reader.read_int_16()  # skip 3 bytes for id and inProgress because default is False
-            reader.read_byte()
-
-            match_type = MatchTypes(reader.read_byte())
-            mods = Mods(reader.read_int_32())
-
-            name = reader.read_osu_string()
-            password = reader.read_osu_string()
-
-            beatmap_name = reader.read_osu_string()
-            beatmap_id = reader.read_int_32()
-            beatmap_md5 = reader.read_osu_string()
-
-            slots = [Slot() for _ in range(0, 16)]  # make slots
-            for slot in slots:
-                slot.status = SlotStatus(reader.read_byte())
-
-            for slot in slots:
-                slot.team = SlotTeams(reader.read_byte())
-
-            for slot in slots:
-                if slot.status.value & SlotStatus.HasPlayer:
-                    reader.read_int_32()
-
-            host_id = reader.read_int_32()
-            play_mode = GameModes(reader.read_byte())
-            scoring_type = MatchScoringTypes(reader.read_byte())
-            team_type = MatchTeamTypes(reader.read_byte())
-            is_freemod = reader.read_bool()
-            match_freemod = MultiSpecialModes(int(is_freemod))
-
-            if is_freemod:
-                for slot in slots:
-                    slot.mods = Mods(reader.read_int_32())
-
-            seed = reader.read_int_32()
-
-            t_dict = {
-                "match_type": match_type,
-                "mods": mods,
-                "name": name,
-                "password": password,
-                "beatmap_name": beatmap_name,
-                "beatmap_id": beatmap_id,
-                "beatmap_md5": beatmap_md5,
-                "slots": slots,
-                "host_id": host_id,
-                "play_mode": play_mode,
-                "scoring_type": scoring_type,
-                "team_type": team_type,
-                "match_freemod": match_freemod,
-                "seed": seed,
-            }
-
-            return t_dict
+    def read_match(data: memoryview) -> TypedReadMatch:
+        reader = KurisoPacketReader(data)
+
+        reader.skip(3)  # skip 3 bytes for id and inProgress because default is False
+
+        match_type = MatchTypes(reader.read_byte())
+        mods = Mods(reader.read_int_32())
+
+        name = reader.read_osu_string()
+        password = reader.read_osu_string()
+
+        beatmap_name = reader.read_osu_string()
+        beatmap_id = reader.read_int_32()
+        beatmap_md5 = reader.read_osu_string()
+
+        slots = [Slot() for _ in range(0, 16)]  # make slots
+        statuses_and_teams = reader.read_struct(MATCH_SLOTS)
+        for (ind, slot) in enumerate(slots):
+            slot.status = SlotStatus(statuses_and_teams[ind])
+            slot.team = SlotTeams(statuses_and_teams[16 + ind])
+
+        # skip ids of players in slots
+        reader.skip(4 * sum(1 for slot in slots if slot.status.value & SlotStatus.HasPlayer))
+
+        host_id, play_mode, scoring_type, team_type, is_freemod = reader.read_struct(
+            MATCH_SETTINGS,
+        )
+        play_mode = GameModes(play_mode)
+        scoring_type = MatchScoringTypes(scoring_type)
+        team_type = MatchTeamTypes(team_type)
+        match_freemod = MultiSpecialModes(int(is_freemod))
+
+        if is_freemod:
+            for (slot, slot_mods) in zip(slots, reader.read_struct(MATCH_FREEMODS)):
+                slot.mods = Mods(slot_mods)
+
+        seed = reader.read_int_32()
+
+        t_dict = {
+            "match_type": match_type,
+            "mods": mods,
+            "name": name,
+            "password": password,
+            "beatmap_name": beatmap_name,
+            "beatmap_id": beatmap_id,
+            "beatmap_md5": beatmap_md5,
+            "slots": slots,
+            "host_id": host_id,
+            "play_mode": play_mode,
+            "scoring_type": scoring_type,
+            "team_type": team_type,
+            "match_freemod": match_freemod,
+            "seed": seed,
+        }
+
+        return t_dict
 
     @staticmethod
-    def read_mp_join_data(data: bytes) -> Tuple[int, str]:
-        with memoryview(data) as buffer:
-            reader = KurisoPacketReader(buffer)
-            return reader.read_int_32(), reader.read_osu_string()
+    def read_mp_join_data(data: memoryview) -> Tuple[int, str]:
+        reader = KurisoPacketReader(data)
+        return reader.read_int_32(), reader.read_osu_string()
 
     @staticmethod
-    def read_mods(data: bytes) -> int:
-        with memoryview(data) as buffer:
-            reader = KurisoPacketReader(buffer)
-            return reader.read_int_32()
+    def read_mods(data: memoryview) -> int:
+        reader = KurisoPacketReader(data)
+        return reader.read_int_32()
 
     @staticmethod
-    def read_user_id(data: bytes) -> int:
-        with memoryview(data) as buffer:
-            reader = KurisoPacketReader(buffer)
-            return reader.read_int_32()
+    def read_user_id(data: memoryview) -> int:
+        reader = KurisoPacketReader(data)
+        return reader.read_int_32()
 
     @staticmethod
-    def read_match_id(data: bytes) -> int:
-        with memoryview(data) as buffer:
-            reader = KurisoPacketReader(buffer)
-            return reader.read_int_32()
+    def read_match_id(data: memoryview) -> int:
+        reader = KurisoPacketReader(data)
+        return reader.read_int_32()
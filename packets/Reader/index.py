@@ -1,16 +1,55 @@
-import struct  # for unpacking/packing float, double
-from typing import List
+import struct  # for unpacking float, double and integers right from request body
+from functools import lru_cache
+from typing import List, Tuple, Union
+
+U_INT_8 = struct.Struct("<B")
+INT_8 = struct.Struct("<b")
+U_INT_16 = struct.Struct("<H")
+INT_16 = struct.Struct("<h")
+U_INT_32 = struct.Struct("<I")
+INT_32 = struct.Struct("<i")
+U_INT_64 = struct.Struct("<Q")
+INT_64 = struct.Struct("<q")
+FLOAT = struct.Struct("<f")
+DOUBLE = struct.Struct("<d")
+
+# packet id (u16), empty byte and length of packet data (i32)
+PACKET_HEADER = struct.Struct("<Hxi")
+
+UNSIGNED_BY_LENGTH = {1: U_INT_8, 2: U_INT_16, 4: U_INT_32, 8: U_INT_64}
+SIGNED_BY_LENGTH = {1: INT_8, 2: INT_16, 4: INT_32, 8: INT_64}
+
+
+@lru_cache(maxsize=64)
+def i32_list_struct(length: int) -> struct.Struct:
+    return struct.Struct(f"<{length}I")
+
+
+def struct_reader(unpacker: struct.Struct):
+    """
+    Makes reader method for fixed-width value, that unpacks it right from reader buffer
+    """
+    size = unpacker.size
+    unpack_from = unpacker.unpack_from
+
+    def reader(self: "KurisoPacketReader") -> Union[int, float]:
+        position = self.position
+        self.position = position + size
+        return unpack_from(self.buffer, position)[0]
+
+    return reader
 
 
 class KurisoPacketReader:
     """
     Very important class ported from JS osu-buffer by @KotRikD
+    Values are unpacked right from the buffer, slices are memoryviews of it (without copying)
     """
 
     __slots__ = ("buffer", "position")
 
-    def __init__(self, buffer: memoryview):
-        self.buffer = buffer
+    def __init__(self, buffer: Union[memoryview, bytes, bytearray]):
+        self.buffer = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
         self.position = 0
 
     @property
@@ -26,98 +65,83 @@ class KurisoPacketReader:
     def EOF(self) -> bool:
         return self.position >= self.length
 
-    def slice_buffer(self, length: int) -> bytes:
+    def slice_buffer(self, length: int) -> memoryview:
+        position = self.position
+        self.position = position + length
+        return self.buffer[position : position + length]
+
+    def skip(self, length: int) -> None:
         self.position += length
-        return bytes(self.buffer[slice(self.position - length, self.position)])
 
-    def peek(self) -> bytes:
-        return bytes(self.buffer[self.position + 1])
+    def peek(self) -> int:
+        # byte at current position, position isn't moved
+        return self.buffer[self.position]
 
-    def read_int(self, byte_length: int) -> int:
-        self.position += byte_length
-        return int.from_bytes(
-            bytes(self.buffer[slice(self.position - byte_length, self.position)]),
-            byteorder="little",
-            signed=True,
-        )
+    def read_packet_header(self) -> Tuple[int, int]:
+        # packet id and length of packet data
+        position = self.position
+        self.position = position + PACKET_HEADER.size
+        return PACKET_HEADER.unpack_from(self.buffer, position)
 
-    def read_u_int(self, byte_length: int) -> int:
-        self.position += byte_length
-        return int.from_bytes(
-            bytes(self.buffer[slice(self.position - byte_length, self.position)]),
-            byteorder="little",
-            signed=False,
-        )
-
-    def read_float(self) -> float:
-        self.position += 4  # float size = 4
-        return struct.unpack(
-            "<f",
-            bytes(self.buffer[slice(self.position - 4, self.position)]),
-        )[0]
-
-    def read_double(self) -> float:
-        self.position += 8  # double size = 8
-        return struct.unpack(
-            "<d",
-            bytes(self.buffer[slice(self.position - 8, self.position)]),
-        )[0]
-
-    def read_int_8(self) -> int:
-        return self.read_int(1)
+    def read_struct(self, unpacker: struct.Struct) -> tuple:
+        position = self.position
+        self.position = position + unpacker.size
+        return unpacker.unpack_from(self.buffer, position)
 
-    def read_string(self, length) -> str:
-        return (self.slice_buffer(length)).decode(errors="ignore")  # ignore, because meh
+    def read_int(self, byte_length: int) -> int:
+        if unpacker := SIGNED_BY_LENGTH.get(byte_length, None):
+            return self.read_struct(unpacker)[0]
 
-    def read_u_int_8(self) -> int:
-        return self.read_u_int(1)
+        return int.from_bytes(self.slice_buffer(byte_length), byteorder="little", signed=True)
 
-    def read_int_16(self) -> int:
-        return self.read_int(2)
+    def read_u_int(self, byte_length: int) -> int:
+        if unpacker := UNSIGNED_BY_LENGTH.get(byte_length, None):
+            return self.read_struct(unpacker)[0]
 
-    def read_u_int_16(self) -> int:
-        return self.read_u_int(2)
+        return int.from_bytes(self.slice_buffer(byte_length), byteorder="little", signed=False)
 
-    def read_int_32(self) -> int:
-        return self.read_int(4)
+    read_float = struct_reader(FLOAT)
+    read_double = struct_reader(DOUBLE)
 
-    def read_u_int_32(self) -> int:
-        return self.read_u_int(4)
+    read_int_8 = struct_reader(INT_8)
+    read_u_int_8 = struct_reader(U_INT_8)
+    read_int_16 = struct_reader(INT_16)
+    read_u_int_16 = struct_reader(U_INT_16)
+    read_int_32 = struct_reader(INT_32)
+    read_u_int_32 = struct_reader(U_INT_32)
+    read_int_64 = struct_reader(INT_64)
+    read_u_int_64 = struct_reader(U_INT_64)
 
-    def read_int_64(self) -> int:
-        return (self.read_int(4) << 8) + self.read_int(4)
+    read_byte = read_u_int_8
 
-    def read_u_int_64(self) -> int:
-        return (self.read_u_int(4) << 8) + self.read_u_int(4)
+    def read_string(self, length) -> str:
+        return str(self.slice_buffer(length), "utf-8", "ignore")  # ignore, because meh
 
     def read_variant(
         self,
     ) -> int:  # big function af, which i doesn't know how to work
+        buffer = self.buffer
+        byte = buffer[self.position]
+        self.position += 1
+        if (byte & 0x80) == 0:
+            return byte
+
         total = 0
         shift = 0
-        byte = self.read_u_int_8()
-        if (byte & 0x80) == 0:
+        while True:
             total |= (byte & 0x7F) << shift
-        else:
-            end = False
-            while not end:
-                if shift:
-                    byte = self.read_u_int_8()
-                total |= (byte & 0x7F) << shift
-                if (byte & 0x80) == 0:
-                    end = True
-                shift += 7
-
-        return total
+            if (byte & 0x80) == 0:
+                return total
+
+            shift += 7
+            byte = buffer[self.position]
+            self.position += 1
 
     def read_u_leb_128(self) -> int:
         return self.read_variant()
 
     def read_bool(self) -> bool:
-        return bool(self.read_int(1))
-
-    def read_byte(self) -> int:
-        return self.read_u_int_8()
+        return self.read_int_8() != 0
 
     def read_osu_string(self) -> str:
         is_string = (self.read_byte()) == 11
@@ -129,8 +153,8 @@ class KurisoPacketReader:
 
     def read_i32_list(self) -> List[int]:
         length = self.read_u_int_16()
-        integers = []
-        for _ in range(length):
-            integers.append(self.read_u_int_32())
+        if not self.can_read(length * 4):
+            # length is sent by client, don't trust it
+            raise struct.error(f"i32 list of {length} items is longer than packet")
 
-        return integers
+        return list(self.read_struct(i32_list_struct(length)))
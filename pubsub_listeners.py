@@ -2,9 +2,10 @@
 Hard-coded
 """
 import asyncio
+import time
 import traceback
+from typing import Union
 
-import async_timeout
 from sentry_sdk import capture_exception
 
 import aioredis
@@ -12,6 +13,7 @@ import aioredis
 from blob import Context
 from config import Config
 from helpers import userHelper, new_utils
+from helpers.statsRefresher import StatsRefresher
 from lib import logger
 from objects.constants.BanchoRanks import BanchoRanks
 from objects.constants.IdleStatuses import Action
@@ -92,10 +94,8 @@ async def update_cached_stats(_, message: dict) -> bool:
     if not data.isdigit():
         return False
 
-    user_id = int(data)
-    if token := Context.players.get_token(uid=user_id):
-        await token.update_stats()
-
+    # stats of players are refreshed in batches
+    StatsRefresher.schedule(int(data))
     return True
 
 
@@ -157,28 +157,78 @@ MAPPED_FUNCTIONS = {
 }
 
 
-async def sub_reader(subscriber: aioredis.client.Redis, ch: aioredis.client.PubSub):
+def event_key(message: dict) -> Union[int, str]:
+    """
+    Events of one user are handled in order they came (ban -> unban, stats updates),
+    user id is taken from plain or json data, other events are ordered per channel
+    """
+    data = message["data"]
+    if data.isdigit():
+        return int(data)
+
+    try:
+        if user_id := json.loads(data).get("userID", 0):
+            return int(user_id)
+    except (ValueError, TypeError, AttributeError):
+        pass
+
+    return message["channel"]
+
+
+async def handle_event(subscriber: aioredis.client.Redis, message: dict):
+    channel = message["channel"]
+    start_time = time.perf_counter()
+    try:
+        await MAPPED_FUNCTIONS[channel](subscriber, message)
+    except Exception as e:
+        capture_exception(e)
+        traceback.print_exc()
+    finally:
+        Context.stats["pubsub_handle_time"].labels(channel=channel).observe(
+            time.perf_counter() - start_time,
+        )
+
+
+async def events_worker(subscriber: aioredis.client.Redis, queue: asyncio.Queue):
     while True:
-        try:
-            async with async_timeout.timeout(1):
-                message = await ch.get_message(ignore_subscribe_messages=True)
-                if message is not None:
+        await handle_event(subscriber, await queue.get())
+
+
+async def sub_reader(subscriber: aioredis.client.Redis, ch: aioredis.client.PubSub):
+    """
+    Waits for events on subscription and passes them to workers by user id, so slow
+    handler delays only events which are queued to the same worker.
+    Worker queues are bounded, reader waits when queue is full.
+    """
+    queues = [
+        asyncio.Queue(maxsize=Config.config["pubsub"]["queue_size"])
+        for _ in range(Config.config["pubsub"]["workers"])
+    ]
+    workers = [asyncio.create_task(events_worker(subscriber, queue)) for queue in queues]
+    try:
+        while True:
+            try:
+                async for message in ch.listen():
+                    if message["type"] != "message":
+                        continue  # subscribe confirmations
+
                     channel = message["channel"]
-                    if channel in MAPPED_FUNCTIONS:
-                        logger.klog(f"<Redis/Pubsub> Received event in {channel}")
-                        await MAPPED_FUNCTIONS[channel](subscriber, message)
-                await asyncio.sleep(0.01)
-        except asyncio.TimeoutError:
-            pass
-        except RuntimeError:
-            pass
+                    if channel not in MAPPED_FUNCTIONS:
+                        continue
 
+                    logger.klog(f"<Redis/Pubsub> Received event in {channel}")
+                    Context.stats["pubsub_events"].labels(channel=channel).inc()
+                    await queues[hash(event_key(message)) % len(queues)].put(message)
+                return  # unsubscribed from all channels
+            except (aioredis.exceptions.ConnectionError, RuntimeError) as e:
+                logger.elog(f"<Redis/Pubsub> Subscription is broken, reconnecting: {e}")
+                await asyncio.sleep(1)
+    finally:
+        for worker in workers:
+            worker.cancel()
 
-async def init():
-    redis_values = dict(db=Config.config["redis"]["db"])
-    if Config.config["redis"]["password"]:
-        redis_values["password"] = Config.config["redis"]["password"]
 
+async def init():
     pubsub = Context.redis.pubsub()
 
     await pubsub.subscribe(*[k for (k, _) in MAPPED_FUNCTIONS.items()])
@@ -0,0 +1,102 @@
+import os
+import sys
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import pytest
+
+# tests import kuriso modules the same way as index.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from blob import Context
+from config import Config
+
+
+class FakeDatabase:
+    """
+    Records queries, fetch_all answers are produced by `rows` callback
+    """
+
+    def __init__(self):
+        self.queries: List[Tuple[str, Mapping]] = []
+        self.rows: Callable[[str, Mapping], List[Mapping]] = lambda query, values: []
+        self.fail = False
+
+    async def execute(self, query: str, values: Mapping = None) -> int:
+        self.queries.append((query, values or {}))
+        if self.fail:
+            raise ConnectionError("mysql is down")
+        return 1
+
+    async def fetch_all(self, query: str, values: Mapping = None) -> List[Mapping]:
+        self.queries.append((query, values or {}))
+        return self.rows(query, values or {})
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.commands: List[Tuple[str, tuple]] = []
+
+    def __getattr__(self, name: str):
+        def command(*args):
+            self.commands.append((name, args))
+            return self
+
+        return command
+
+    async def execute(self) -> List[Any]:
+        self.redis.pipelines.append(self.commands)
+        if self.redis.fail:
+            raise ConnectionError("redis is down")
+        return [self.redis.answer(name, args) for (name, args) in self.commands]
+
+
+class FakeRedis:
+    """
+    Records pipelines and commands, keeps sets for sadd/srem
+    """
+
+    def __init__(self):
+        self.pipelines: List[List[Tuple[str, tuple]]] = []
+        self.commands: List[Tuple[str, tuple]] = []
+        self.sets: Dict[str, set] = {}
+        self.ranks: Dict[Tuple[str, str], int] = {}
+        self.fail = False
+
+    def answer(self, name: str, args: tuple) -> Optional[Any]:
+        if name == "sadd":
+            self.sets.setdefault(args[0], set()).update(args[1:])
+        elif name == "srem":
+            self.sets.get(args[0], set()).difference_update(args[1:])
+        elif name == "zrevrank":
+            return self.ranks.get(args, None)
+        return None
+
+    async def srem(self, *args) -> None:
+        self.commands.append(("srem", args))
+        self.answer("srem", args)
+
+    def pipeline(self, **_) -> FakePipeline:
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def config(monkeypatch) -> Dict[str, Any]:
+    monkeypatch.setattr(Config, "config", Config.config)  # restored after test
+    Config.load_config()
+    return Config.config
+
+
+@pytest.fixture
+def fake_mysql(monkeypatch) -> FakeDatabase:
+    database = FakeDatabase()
+    monkeypatch.setattr(Context, "mysql", database)
+    return database
+
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> FakeRedis:
+    redis = FakeRedis()
+    monkeypatch.setattr(Context, "redis", redis)
+    return redis
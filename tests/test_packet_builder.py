@@ -0,0 +1,47 @@
+from packets.Builder.index import KurisoPacketWriter, PacketSchema
+from packets.OsuPacketID import OsuPacketID
+from packets.Reader.OsuTypes import osuTypes
+
+
+def test_writer_returns_only_written_part():
+    writer = KurisoPacketWriter(capacity=4)
+    writer.write_int_32(1)
+    writer.write_osu_string("kuriso")  # grows buffer
+    assert writer.get_string() == b"\x01\x00\x00\x00\x0b\x06kuriso"
+
+
+def test_i32_list_lengths():
+    packet = KurisoPacketWriter.CreateBanchoPacket(
+        OsuPacketID.Bancho_ChannelListingComplete,
+        ((1, 2), osuTypes.i32_list),
+        ((3,), osuTypes.i32_list4l),
+    )
+    body = b"\x02\x00\x01\x00\x00\x00\x02\x00\x00\x00" b"\x01\x00\x00\x00\x03\x00\x00\x00"
+    assert packet == b"\x59\x00\x00" + len(body).to_bytes(4, "little") + body
+
+
+def test_schema_and_writer_give_same_bytes():
+    schema = PacketSchema(
+        OsuPacketID.Bancho_ChannelListingComplete,
+        osuTypes.int32,
+        osuTypes.i32_list4l,
+        osuTypes.string,
+    )
+    packet = KurisoPacketWriter.CreateBanchoPacket(
+        OsuPacketID.Bancho_ChannelListingComplete,
+        (7, osuTypes.int32),
+        ((1, 2), osuTypes.i32_list4l),
+        ("hi", osuTypes.string),
+    )
+    assert schema(7, (1, 2), "hi") == packet
+
+
+def test_raw_schema_accepts_bytes_like_data():
+    schema = PacketSchema(OsuPacketID.Bancho_SpectateFrames, osuTypes.raw)
+    expected = KurisoPacketWriter.CreateBanchoPacket(
+        OsuPacketID.Bancho_SpectateFrames, (b"frame", osuTypes.raw)
+    )
+
+    assert schema(b"frame") == expected
+    assert schema(bytearray(b"frame")) == expected
+    assert schema(memoryview(b"xframe")[1:]) == expected
@@ -0,0 +1,37 @@
+import struct
+
+import pytest
+
+from packets.Reader.index import KurisoPacketReader
+
+
+def test_read_i32_list():
+    reader = KurisoPacketReader(struct.pack("<H3I", 3, 1, 2, 1000))
+    assert reader.read_i32_list() == [1, 2, 1000]
+    assert reader.EOF()
+
+
+def test_read_i32_list_longer_than_packet():
+    # client says 100 items, but sends only two
+    reader = KurisoPacketReader(struct.pack("<H2I", 100, 1, 2))
+    with pytest.raises(struct.error):
+        reader.read_i32_list()
+
+
+def test_short_fixed_read_raises():
+    reader = KurisoPacketReader(b"\x01\x02")
+    with pytest.raises(struct.error):
+        reader.read_int_32()
+
+
+def test_peek_doesnt_move_position():
+    reader = KurisoPacketReader(b"\x0b\x03abc")
+    assert reader.peek() == 11
+    assert reader.position == 0
+    assert reader.read_osu_string() == "abc"
+
+
+def test_read_int_64():
+    reader = KurisoPacketReader(struct.pack("<qQ", -(2**40), 2**63 + 5))
+    assert reader.read_int_64() == -(2**40)
+    assert reader.read_u_int_64() == 2**63 + 5
@@ -0,0 +1,56 @@
+from objects.PacketSnapshot import PacketSnapshot
+
+
+class FakePlayer:
+    def __init__(self, packet: bytes):
+        self.packet = packet
+
+
+def make_snapshot() -> PacketSnapshot:
+    return PacketSnapshot(lambda p: p.packet)
+
+
+def test_put_joins_packets_in_order():
+    snapshot = make_snapshot()
+    players = [FakePlayer(bytes([ind]) * (ind + 1)) for ind in range(5)]
+    for p in players:
+        snapshot.put(p)
+
+    assert len(snapshot) == 5
+    assert snapshot.get_blob() == b"".join(p.packet for p in players)
+
+
+def test_resize_and_remove_match_fresh_snapshot():
+    snapshot = make_snapshot()
+    players = [FakePlayer(b"p%d" % ind) for ind in range(4)]
+    for p in players:
+        snapshot.put(p)
+    snapshot.get_blob()
+
+    players[1].packet = b"longer packet of player 1"
+    snapshot.put(players[1])
+    players[2].packet = b"x"
+    snapshot.put(players[2])
+    snapshot.remove(players[0])
+
+    fresh = make_snapshot()
+    for p in players[1:]:
+        fresh.put(p)
+
+    assert snapshot.get_blob() == fresh.get_blob()
+    assert snapshot.get_blob() == b"longer packet of player 1" + b"x" + b"p3"
+
+
+def test_blob_is_cached_until_change():
+    snapshot = make_snapshot()
+    player = FakePlayer(b"abc")
+    snapshot.put(player)
+
+    blob = snapshot.get_blob()
+    assert snapshot.get_blob() is blob
+
+    snapshot.remove(FakePlayer(b"unknown"))  # removing missing player keeps cache
+    assert snapshot.get_blob() is blob
+
+    snapshot.remove(player)
+    assert snapshot.get_blob() == b""
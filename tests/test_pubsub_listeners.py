@@ -0,0 +1,72 @@
+import asyncio
+import json
+import time
+from typing import List, Optional
+
+import pytest
+
+import pubsub_listeners
+
+
+class FakePubSub:
+    def __init__(self):
+        self.events: asyncio.Queue = asyncio.Queue()
+
+    async def listen(self):
+        yield {"type": "subscribe", "channel": "test:a", "data": 1}
+        while True:
+            message: Optional[dict] = await self.events.get()
+            if message is None:
+                return
+            yield message
+
+
+def event(channel: str, data: str) -> dict:
+    return {"type": "message", "channel": channel, "data": data}
+
+
+@pytest.fixture(name="handled")
+def fixture_handled(monkeypatch, config) -> List[tuple]:
+    config["pubsub"]["workers"] = 4
+    handled = []
+    start_time = time.perf_counter()
+
+    async def slow(_, message):
+        await asyncio.sleep(0.2)
+        handled.append(("slow", message["data"], time.perf_counter() - start_time))
+
+    async def fast(_, message):
+        handled.append(("fast", message["data"], time.perf_counter() - start_time))
+
+    monkeypatch.setattr(pubsub_listeners, "MAPPED_FUNCTIONS", {"test:a": slow, "test:b": fast})
+    return handled
+
+
+def run_events(*events: dict) -> None:
+    async def run():
+        pubsub = FakePubSub()
+        reader = asyncio.create_task(pubsub_listeners.sub_reader(None, pubsub))
+        for message in events:
+            await pubsub.events.put(message)
+        await asyncio.sleep(0.5)
+        await pubsub.events.put(None)
+        await reader
+
+    asyncio.run(run())
+
+
+def test_events_of_one_user_keep_order(handled):
+    run_events(event("test:a", "5"), event("test:b", json.dumps({"userID": 5})))
+    assert [name for (name, _, _) in handled] == ["slow", "fast"]
+
+
+def test_slow_handler_doesnt_delay_other_users(handled):
+    run_events(event("test:a", "1"), event("test:b", "2"))
+    timings = {name: at for (name, _, at) in handled}
+    assert timings["fast"] < 0.1 < timings["slow"]
+
+
+def test_event_key():
+    assert pubsub_listeners.event_key(event("test:a", "17")) == 17
+    assert pubsub_listeners.event_key(event("test:a", '{"userID": 3, "reason": ""}')) == 3
+    assert pubsub_listeners.event_key(event("test:a", "reload")) == "test:a"
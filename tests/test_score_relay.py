@@ -0,0 +1,128 @@
+from typing import List
+
+import pytest
+
+from objects.ScoreRelay import ScoreRelay
+from objects.constants.Slots import SlotStatus
+
+
+class FakeToken:
+    def __init__(self, name: str):
+        self.name = name
+        self.queue: List[bytes] = []
+
+    def enqueue(self, b: bytes) -> None:
+        self.queue.append(b)
+
+
+class FakeSlot:
+    def __init__(self, status: SlotStatus, token: FakeToken = None):
+        self.status = status
+        self.token = token
+
+
+@pytest.fixture(name="slots")
+def fixture_slots() -> List[FakeSlot]:
+    return [
+        FakeSlot(SlotStatus.Playing, FakeToken("first")),
+        FakeSlot(SlotStatus.Playing, FakeToken("second")),
+        FakeSlot(SlotStatus.NotReady, FakeToken("waiting")),
+        FakeSlot(SlotStatus.Open),
+    ]
+
+
+def test_only_playing_slots_are_relayed(slots):
+    relay = ScoreRelay(slots)
+    relay.start()
+
+    assert relay.get_slot_id(slots[0].token) == 0
+    assert relay.get_slot_id(slots[1].token) == 1
+    assert relay.get_slot_id(slots[2].token) is None
+    relay.push(0, b"first-1")
+    assert relay.read(slots[2].token) == b""
+
+
+def test_latest_frame_per_slot_wins(slots):
+    relay = ScoreRelay(slots)
+    relay.start()
+    first, second = slots[0].token, slots[1].token
+
+    relay.push(0, b"first-1")
+    relay.push(1, b"second-1")
+    relay.push(0, b"first-2")
+
+    assert relay.read(first) == b"first-2second-1"
+    assert relay.read(first) == b""
+
+    relay.push(1, b"second-2")
+    assert relay.read(first) == b"second-2"
+    assert relay.read(second) == b"first-2second-2"
+
+
+def test_finished_player_gets_unread_frames(slots):
+    relay = ScoreRelay(slots)
+    relay.start()
+    first, second = slots[0].token, slots[1].token
+    relay.push(1, b"second-1")
+
+    # first completes map before his next poll
+    relay.finish(first)
+    slots[0].status = SlotStatus.Complete
+    assert first.queue == [b"second-1"]
+
+    relay.push(1, b"second-2")
+    relay.push(0, b"first-late")  # finished player's frames are still relayed
+    assert relay.read(first) == b""
+    assert relay.read(second) == b"first-latesecond-2"
+
+
+def test_removed_and_stopped_players_get_unread_frames(slots):
+    relay = ScoreRelay(slots)
+    relay.start()
+    first, second = slots[0].token, slots[1].token
+    relay.push(0, b"first-1")
+
+    relay.remove(first)
+    assert relay.get_slot_id(first) is None
+    assert first.queue == [b"first-1"]
+
+    relay.push(1, b"second-1")
+    relay.stop()
+    assert second.queue == [b"first-1second-1"]
+    assert first.queue == [b"first-1"]
+
+
+def test_restart_drops_old_frames(slots):
+    relay = ScoreRelay(slots)
+    relay.start()
+    relay.push(0, b"old")
+    relay.read(slots[0].token)
+    relay.read(slots[1].token)
+
+    relay.start()
+    assert relay.read(slots[1].token) == b""
+
+    relay.push(1, b"new")
+    assert relay.read(slots[0].token) == b"new"
+
+
+def test_frames_keep_order_with_match_packets(config):
+    # pylint: disable=import-outside-toplevel,protected-access
+    from objects.Player import Player
+
+    config["queue"]["spectator_max_size"] = 0
+    player = Player(1, "player", 0)
+    slot = FakeSlot(SlotStatus.Playing, player)
+    relay = ScoreRelay([slot])
+
+    class FakeMatch:
+        score_relay = relay
+
+    player._match = FakeMatch()
+    relay.start()
+
+    relay.push(0, b"score1")
+    player.enqueue(b"match-update")
+    relay.push(0, b"score2")
+
+    assert player.dequeue() == b"score1match-updatescore2"
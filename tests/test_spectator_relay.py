@@ -0,0 +1,66 @@
+from objects.SpectatorRelay import SpectatorRelay
+
+
+def test_spectators_read_frames_from_own_cursor():
+    relay = SpectatorRelay()
+    relay.push(b"lost")  # nobody spectates yet
+    relay.add_spectator("first")
+    relay.push(b"a")
+
+    relay.add_spectator("second")  # gets only frames after join
+    relay.push(b"b")
+
+    assert relay.read("first") == b"ab"
+    assert relay.read("first") == b""
+    assert relay.read("second") == b"b"
+    assert relay.read("unknown") == b""
+
+
+def test_read_frames_are_trimmed():
+    relay = SpectatorRelay()
+    relay.add_spectator("first")
+    relay.add_spectator("second")
+    relay.push(b"aaaa")
+    relay.push(b"bb")
+
+    assert relay.read("first") == b"aaaabb"
+    assert relay.read("second") == b"aaaabb"
+    assert not relay.buffer
+    assert relay.base == relay.end == 6
+
+    relay.push(b"c")
+    relay.remove_spectator("first")
+    assert relay.read("second") == b"c"
+
+
+def test_oldest_frames_are_dropped_over_max_size():
+    relay = SpectatorRelay(max_size=5)
+    relay.add_spectator("slow")
+    relay.add_spectator("fast")
+    relay.push(b"aaa")
+    assert relay.read("fast") == b"aaa"
+
+    relay.push(b"bbb")
+    relay.push(b"cc")
+    assert relay.read("slow") == b"bbbcc"
+    assert relay.read("fast") == b"bbbcc"
+
+    relay.push(b"x" * 8)  # frame bigger than limit is still sent
+    assert relay.read("slow") == b"x" * 8
+
+
+def test_frames_keep_order_with_queued_packets(config):
+    # pylint: disable=import-outside-toplevel
+    from objects.Player import Player
+
+    config["queue"]["spectator_max_size"] = 0
+    host = Player(1, "host", 0)
+    spectator = Player(2, "spectator", 0)
+    spectator.spectating = host
+    host.spectator_relay.add_spectator(spectator)
+
+    host.spectator_relay.push(b"frame1")
+    spectator.enqueue(b"notice")
+    host.spectator_relay.push(b"frame2")
+
+    assert spectator.dequeue() == b"frame1noticeframe2"
@@ -0,0 +1,106 @@
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from blob import Context
+from helpers.statsRefresher import ALL_MODES, StatsRefresher
+from objects.constants.GameModes import GameModes
+
+
+class FakePlayer:
+    def __init__(self, user_id: int, is_restricted: bool = False):
+        self.id = user_id
+        self.is_restricted = is_restricted
+        self.stats = None
+        self.positions = None
+        self.received: List[bytes] = []
+
+    @property
+    def stats_packet(self) -> bytes:
+        return b"stats%d;" % self.id
+
+    def apply_stats(self, stats: Dict, positions: List) -> None:
+        self.stats = stats
+        self.positions = positions
+
+    def enqueue(self, data: bytes) -> None:
+        self.received.append(data)
+
+
+class FakeStorage:
+    def __init__(self, tokens: List[FakePlayer]):
+        self.players = {p.id: p for p in tokens}
+
+    def get_token(self, uid: int = None):
+        return self.players.get(uid, None)
+
+    def unrestricted_tokens(self):
+        return (p for p in self.players.values() if not p.is_restricted)
+
+
+def stats_rows(_, values: Dict) -> List[Dict]:
+    return [
+        {
+            "id": user_id,
+            **{
+                f"{field}_{GameModes.resolve_to_str(mode)}": user_id
+                for mode in ALL_MODES
+                for field in (
+                    "total_score",
+                    "ranked_score",
+                    "pp",
+                    "total_plays",
+                    "accuracy",
+                    "playtime",
+                )
+            },
+        }
+        for user_id in values.values()
+    ]
+
+
+@pytest.fixture(name="players")
+def fixture_players(monkeypatch, config, fake_mysql, fake_redis) -> List[FakePlayer]:
+    config["stats"]["refresh_window"] = 10
+    fake_mysql.rows = stats_rows
+    fake_redis.ranks[("ripple:leaderboard:std", "1")] = 4
+
+    players = [FakePlayer(1), FakePlayer(2), FakePlayer(3, is_restricted=True), FakePlayer(4)]
+    monkeypatch.setattr(Context, "players", FakeStorage(players))
+    monkeypatch.setattr(StatsRefresher, "pending", set())
+    monkeypatch.setattr(StatsRefresher, "is_scheduled", False)
+    return players
+
+
+def test_events_in_window_are_refreshed_together(players, fake_mysql, fake_redis):
+    async def run():
+        for user_id in (1, 2, 3, 1, 999):  # 999 is offline
+            StatsRefresher.schedule(user_id)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    assert len(fake_mysql.queries) == 1
+    assert sorted(fake_mysql.queries[0][1].values()) == [1, 2, 3]  # offline user is skipped
+    assert len(fake_redis.pipelines) == 1
+    assert len(fake_redis.pipelines[0]) == 3 * len(ALL_MODES)
+
+    assert players[0].stats[GameModes.STD]["pp"] == 1
+    assert players[0].positions[0] == 4
+    assert players[3].stats is None  # nothing was changed
+
+
+def test_refreshed_stats_are_broadcast_once(players):
+    async def run():
+        for user_id in (1, 2, 3):
+            StatsRefresher.schedule(user_id)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    broadcast = b"stats1;stats2;"
+    for player in (players[0], players[1], players[3]):
+        assert player.received == [broadcast]
+    # restricted player isn't visible for others, but gets his own stats
+    assert players[2].received == [b"stats3;"]
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from helpers.writeBehind import WriteBehind
+
+HASHES = ["", "", "mac", "unique", "disk"]
+
+
+@pytest.fixture(autouse=True)
+def empty_queue(monkeypatch, config):
+    config["write_behind"]["max_pending"] = 3
+    config["write_behind"]["max_retries"] = 2
+    for (name, value) in (
+        ("hardware", {}),
+        ("osu_versions", {}),
+        ("countries", {}),
+        ("sessions", {}),
+        ("attempts", {}),
+        ("is_flush_scheduled", False),
+        ("flush_lock", None),
+    ):
+        monkeypatch.setattr(WriteBehind, name, value)
+
+
+def test_flushes_when_max_pending_reached(fake_mysql, fake_redis):
+    async def run():
+        WriteBehind.set_osu_version(1, "b20220101")
+        WriteBehind.set_osu_version(1, "b20220202")  # coalesced
+        WriteBehind.set_country(1, "RU")
+        await asyncio.sleep(0)
+        assert not fake_mysql.queries
+
+        WriteBehind.save_session(1, "127.0.0.1")  # third pending write
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+
+    assert len(fake_mysql.queries) == 2
+    assert {"id_0": 1, "value_0": "b20220202"} in [values for (_, values) in fake_mysql.queries]
+    assert fake_redis.sets["peppy:sessions:1"] == {"127.0.0.1"}
+    assert WriteBehind.pending_count() == 0
+
+
+def test_hardware_logins_are_counted_and_bad_hashes_ignored(fake_mysql):
+    WriteBehind.log_hardware(1, HASHES)
+    WriteBehind.log_hardware(1, HASHES)
+    WriteBehind.log_hardware(2, ["only", "three", "hashes"])
+    asyncio.run(WriteBehind.flush())
+
+    ((query, values),) = fake_mysql.queries
+    assert "INSERT INTO hw_user" in query
+    assert values == {
+        "uid_0": 1,
+        "mac_0": "mac",
+        "unique_id_0": "unique",
+        "disk_id_0": "disk",
+        "count_0": 2,
+    }
+
+
+def test_session_removal_keeps_order(fake_redis):
+    WriteBehind.save_session(1, "127.0.0.1")
+    asyncio.run(WriteBehind.flush())
+    WriteBehind.remove_session(1, "127.0.0.1")
+    WriteBehind.save_session(2, "127.0.0.2")
+    WriteBehind.remove_session(2, "127.0.0.2")  # logout before session was written
+    asyncio.run(WriteBehind.flush())
+
+    assert not fake_redis.sets["peppy:sessions:1"]
+    assert not fake_redis.sets.get("peppy:sessions:2", set())
+
+
+def test_failed_writes_are_retried_then_dropped(fake_mysql):
+    fake_mysql.fail = True
+    WriteBehind.log_hardware(1, HASHES)
+    asyncio.run(WriteBehind.flush())
+    assert WriteBehind.hardware == {(1, "mac", "unique", "disk"): 1}
+
+    WriteBehind.log_hardware(1, HASHES)  # newer login is merged with failed one
+    asyncio.run(WriteBehind.flush())
+    assert WriteBehind.hardware == {(1, "mac", "unique", "disk"): 2}
+
+    asyncio.run(WriteBehind.flush())  # third failure is over max_retries
+    assert not WriteBehind.hardware
+    assert len(fake_mysql.queries) == 3
+
+
+def test_failed_writes_are_kept_before_newer_ones(config, fake_mysql):
+    config["write_behind"]["max_pending"] = 100
+    fake_mysql.fail = True
+    WriteBehind.set_country(1, "RU")
+    WriteBehind.set_country(2, "DE")
+    asyncio.run(WriteBehind.flush())
+
+    WriteBehind.set_country(3, "FR")
+    WriteBehind.set_country(2, "US")
+    assert WriteBehind.countries == {1: "RU", 2: "US", 3: "FR"}
+
+    fake_mysql.fail = False
+    asyncio.run(WriteBehind.flush())
+    assert not WriteBehind.countries
+    assert not WriteBehind.attempts